@@ -1,10 +1,20 @@
+import os
+
 from PyQt5 import QtWidgets
-from PyQt5.QtWidgets import QVBoxLayout
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QShortcut, QVBoxLayout
 
+from app.model.filter_model import FilterModel
 from app.services.mouse_signal_input import MouseSignalInput
-from app.services.zplane_controller import ZPlaneController
+from app.services.zplane_controller import PHASE_VIEWS, ZPlaneController
 from app.ui.design import Ui_MainWindow
+from app.ui.perf_hud import PerfHUD
 from app.utils.clean_cache import remove_directories
+from app.utils.perf_monitor import perf_monitor
+
+
+# Saved designs in this directory are added to the filter library at startup
+FILTER_LIBRARY_DIRECTORY = os.environ.get("DIGITAL_FILTER_LIBRARY", "filter_library")
 
 
 class MainWindowController(QtWidgets.QMainWindow):
@@ -15,12 +25,13 @@ class MainWindowController(QtWidgets.QMainWindow):
         self.ui.setupUi(self)
         self.initialize_z_plane()
         self.initialize_mouse_signal_input()
-        # self.zplane_controller.export_filter_to_c()
+        self.initialize_perf_hud()
 
         self.connect_signals()
 
     def initialize_z_plane(self):
-        # Initialize ZPlaneController
+        # The filter state lives in the model; the z-plane controller is a view over it
+        self.filter_model = FilterModel()
         self.zplane_controller = ZPlaneController(
             self.ui.z_plane_plot_widget,
             self.ui.magnitude_plot_widget,
@@ -33,18 +44,31 @@ class MainWindowController(QtWidgets.QMainWindow):
             self.ui.all_pass_remove_radioButton,
             self.ui.all_pass_add_radioButton,
             self.ui.select_all_pass_filters_button,
-            self.ui.create_button
+            self.ui.create_button,
+            model=self.filter_model
         )
+        if os.path.isdir(FILTER_LIBRARY_DIRECTORY):
+            self.filter_model.load_saved_filters(FILTER_LIBRARY_DIRECTORY)
 
     def initialize_mouse_signal_input(self):
         """Set up the mouse signal generator."""
         self.original_plot_widget = self.ui.original_plot_widget  # Plot to display the signal
-        self.mouse_signal_input = MouseSignalInput(self.original_plot_widget, self.ui.filtered_plot_widget, self.zplane_controller,self.ui.all_pass_add_radioButton,self.ui.all_pass_remove_radioButton)
+        self.mouse_signal_input = MouseSignalInput(self.original_plot_widget, self.ui.filtered_plot_widget, self.filter_model,self.ui.all_pass_add_radioButton,self.ui.all_pass_remove_radioButton)
 
         # Embed the MouseSignalInput into the padding_area
         self.padding_area_layout = QVBoxLayout(self.ui.padding_area)
         self.padding_area_layout.addWidget(self.mouse_signal_input)
 
+    def initialize_perf_hud(self):
+        """Latency overlay: F12 toggles it (and the instrumentation), Ctrl+F12 dumps the stats to JSON."""
+        self.perf_hud = PerfHUD(perf_monitor, self.ui.centralwidget)
+        QShortcut(QKeySequence("F12"), self, activated=self.perf_hud.toggle)
+        QShortcut(QKeySequence("Ctrl+F12"), self, activated=self.dump_perf_stats)
+
+    def dump_perf_stats(self):
+        path = perf_monitor.dump_json("perf_stats.json")
+        print(f"Latency stats written to {path}")
+
     def connect_signals(self):
         self.ui.quit_button.clicked.connect(self.quit_app)
         #self.ui.horizontalSlider.valueChanged.connect(self.ui.update_slider_label)
@@ -60,20 +84,44 @@ class MainWindowController(QtWidgets.QMainWindow):
         self.ui.undo_button.clicked.connect(self.zplane_controller.undo)
         self.ui.redo_button.clicked.connect(self.zplane_controller.redo)
         # Populate the combobox with filters
-        self.ui.filters_library_combobox.addItems(self.zplane_controller.filter_library.keys())
+        self.ui.filters_library_combobox.addItems(self.filter_model.filter_library.keys())
         self.ui.filters_library_combobox.currentIndexChanged.connect(self.apply_selected_filter)
         self.ui.filter_realizaion_structure.clicked.connect(self.zplane_controller.display_circuit_in_groupbox)
+        self.ui.filter_realization_code.clicked.connect(lambda: self.zplane_controller.export_filter_to_c())
+        self.ui.sweep_button.clicked.connect(self.run_all_pass_sweep)
+        self.ui.equalize_button.clicked.connect(self.run_phase_equalizer)
         self.zplane_controller.configure_x_axis(self.ui.magnitude_plot_widget)
         self.zplane_controller.configure_x_axis(self.ui.phase_plot_widget)
+        self.ui.phase_view_combobox.addItems(PHASE_VIEWS.keys())
+        self.ui.phase_view_combobox.currentTextChanged.connect(self.zplane_controller.set_phase_view)
 
     def apply_selected_filter(self, index):
         """Handle filter selection from the combobox."""
         if index < 0:
             return  # Ignore invalid selection
         filter_name = self.ui.filters_library_combobox.itemText(index)
-        self.zplane_controller.filter_selection = filter_name
-        self.zplane_controller.update_z_plane_from_filter()  # Update Z-plane
-        self.mouse_signal_input.set_filter(filter_name)
+        with perf_monitor.stage("combobox_to_redraw"):
+            self.filter_model.filter_selection = filter_name
+            self.zplane_controller.update_z_plane_from_filter()  # Update Z-plane
+            self.mouse_signal_input.set_filter(filter_name)
+            self.zplane_controller.repaint_for_timing()
+
+    def run_all_pass_sweep(self):
+        """Let the user pick one of the best filter and all-pass combinations and apply it."""
+        result = self.zplane_controller.openSweepPopup()
+        if result is None:
+            return
+        # The model loads the base filter itself, so the combobox only mirrors it
+        combobox = self.ui.filters_library_combobox
+        combobox.blockSignals(True)
+        combobox.setCurrentText(result["filter"])
+        combobox.blockSignals(False)
+        self.zplane_controller.apply_sweep_result(result)
+        self.mouse_signal_input.set_filter(result["filter"])
+
+    def run_phase_equalizer(self):
+        if self.zplane_controller.openEqualizerPopup() is not None:
+            self.mouse_signal_input.apply_filter()
 
     def quit_app(self):
         self.app.quit()
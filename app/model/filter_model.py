@@ -0,0 +1,452 @@
+"""
+Qt-free model of the filter being designed.
+
+FilterModel holds the z-plane roots and gain, the library of designs and
+their parameters, the all-pass sections and whether they are applied, and
+the undo history, and derives the effective filter, its coefficient forms
+and its frequency response from them. Widgets only forward edits to it and
+draw what it reports, so scripts, batch workers and headless tests can use
+the same model without importing PyQt.
+"""
+from functools import partial
+
+import numpy as np
+
+from app.services.c_export import export_c
+from app.services.filter_design import FilterDesignCache
+from app.services.filter_library import FilterLibrary
+from app.services.frequency_response import AdaptiveResponse
+from app.services.sos_filter import roots_to_sos
+from app.utils.edit_history import EditHistory
+from app.utils.filter_io import read_filter_csv, read_filter_npz, write_filter_csv, write_filter_npz
+from app.utils.perf_monitor import perf_monitor
+from app.utils.root_index import RootIndex
+
+
+# Built-in library: design parameters per entry, designed in zero-pole-gain form
+FILTER_SPECS = {
+    # None Option
+    "None": {"family": "none"},  # No filtering applied
+
+    # Butterworth Filters
+    "Butterworth LPF": {"family": "butter", "btype": "low", "order": 4, "cutoff": 0.4},
+    "Butterworth HPF": {"family": "butter", "btype": "high", "order": 4, "cutoff": 0.4},
+    "Butterworth BPF": {"family": "butter", "btype": "band", "order": 4, "cutoff": [0.3, 0.6]},
+
+    # Chebyshev I Filter
+    "Chebyshev I LPF": {"family": "cheby1", "btype": "low", "order": 4, "cutoff": 0.4, "ripple": 1},
+    "Chebyshev I HPF": {"family": "cheby1", "btype": "high", "order": 4, "cutoff": 0.4, "ripple": 1},
+    "Chebyshev I BPF": {"family": "cheby1", "btype": "band", "order": 4, "cutoff": [0.3, 0.6], "ripple": 1},
+
+    # Chebyshev II Filters
+    "Chebyshev II LPF": {"family": "cheby2", "btype": "low", "order": 4, "cutoff": 0.4, "attenuation": 20},
+    "Chebyshev II HPF": {"family": "cheby2", "btype": "high", "order": 4, "cutoff": 0.4, "attenuation": 20},
+    "Chebyshev II BPF": {"family": "cheby2", "btype": "band", "order": 4, "cutoff": [0.3, 0.6], "attenuation": 20},
+
+    # Elliptic Filters
+    "Elliptic LPF": {"family": "ellip", "btype": "low", "order": 4, "cutoff": 0.4, "ripple": 1, "attenuation": 20},
+    "Elliptic HPF": {"family": "ellip", "btype": "high", "order": 4, "cutoff": 0.4, "ripple": 1, "attenuation": 20},
+}
+
+# Built-in all-pass sections
+ALL_PASS_LIBRARY = {
+    "All-Pass 1": {'zeros': [-2], 'poles': [-0.5]},
+    "All-Pass 2": {'zeros': [1/0.8], 'poles': [0.8]},
+    "All-Pass 3": {'zeros': [-2-1j], 'poles': [1/(-2+1j)]},
+    "All-Pass 4": {'zeros': [2j], 'poles': [1 / (-2j)]},
+}
+
+
+def _sections(all_pass):
+    """All-pass sections read from a file, with plain lists of roots so selections compare by value."""
+    return [{kind: [complex(root) for root in section[kind]] for kind in ("zeros", "poles")} for section in all_pass]
+
+
+class FilterModel:
+    """
+    Zeros, poles, gain and all-pass sections of the filter being designed.
+
+    Every edit bumps `coefficients_version`, which keys the cached derived
+    forms (effective roots, "ba" and "sos" coefficients), and is recorded in
+    `history`; `commit` closes the edits made since the last call as one
+    undoable step. The all-pass sections in `selected_all_pass_filters` are
+    part of the effective filter while `all_pass_enabled` is set.
+    """
+
+    def __init__(self, design_cache=None):
+        # Zeros and poles live in a spatial index with stable ids
+        self.root_index = RootIndex()
+        self.gain = 1.0  # Explicit gain of the zero-pole-gain model
+        self.coefficients_version = 0  # Bumped whenever the effective filter changes
+        self.coefficient_cache = {}  # Derived forms of the current version, built on first use
+        self.coefficient_cache_version = None
+        self.response = AdaptiveResponse()
+
+        # Filter library: designs are memoized by the cache
+        self.design_cache = design_cache if design_cache is not None else FilterDesignCache(max_size=128)
+        self.filter_specs = {name: dict(spec) for name, spec in FILTER_SPECS.items()}
+        self.filter_library = {name: partial(self.design_filter, name, output="zpk") for name in self.filter_specs}
+        self.saved_filters = None  # FilterLibrary of designs saved on disk, see load_saved_filters
+        self.filter_selection = "None"  # Default to no filtering
+
+        # All-pass sections
+        self.all_pass_filter_library = {name: dict(section) for name, section in ALL_PASS_LIBRARY.items()}
+        self.selected_all_pass_filters = []
+        self.all_pass_enabled = False
+
+        # Undo/redo: the root index reports every edit as a delta to the history
+        self.history = EditHistory(self.apply_history_delta, self.history_snapshot, self.restore_history_snapshot)
+        self.root_index.listener = self.record
+        self.recorded_all_pass_state = self.all_pass_state()
+
+    def record(self, delta):
+        """Record one edit of the pending step and invalidate the derived forms."""
+        self.coefficients_version += 1
+        self.history.record(delta)
+
+    def commit(self):
+        """Close the edits made since the last call as one undoable step."""
+        self.history.commit()
+
+    # Library
+
+    def warm_designs(self):
+        """Design every library filter ahead of time, so selecting one is a cache hit."""
+        self.design_cache.warm([dict(spec, output="zpk") for spec in self.filter_specs.values()])
+
+    def design_filter(self, filter_name, output="zpk", **overrides):
+        """Return the (cached) design of a library filter, optionally overriding its parameters."""
+        if filter_name not in self.filter_specs:
+            if self.saved_filters is None or filter_name not in self.saved_filters:
+                raise KeyError(f"Unknown library filter: {filter_name}")
+            return self.saved_filters.design(filter_name, output=output)
+        spec = dict(self.filter_specs[filter_name], output=output, **overrides)
+        return self.design_cache.design(**spec)
+
+    def set_filter_parameters(self, filter_name, **params):
+        """Change the design parameters (order, cutoff, ripple, attenuation...) of a library filter."""
+        self.filter_specs[filter_name].update(params)
+        if filter_name == self.filter_selection:
+            self.load_selected_filter()
+
+    def load_saved_filters(self, directory):
+        """Add every filter listed in the index of a library directory to `filter_library`."""
+        self.saved_filters = FilterLibrary(directory)
+        names = [name for name in self.saved_filters.names() if name not in self.filter_specs]
+        for name in names:
+            self.filter_library[name] = partial(self.design_filter, name, output="zpk")
+        return names
+
+    def save_to_library(self, name, **metadata):
+        """Save the z-plane design and all-pass selection into the library directory under `name`."""
+        if name in self.filter_specs:
+            raise ValueError(f"{name} is a built-in library filter")
+        if self.saved_filters is None:
+            raise RuntimeError("No saved filter library is loaded; call load_saved_filters first")
+        entry = self.saved_filters.save(name, self.zeros, self.poles, self.gain,
+                                        all_pass=self.selected_all_pass_filters, **metadata)
+        self.filter_library[name] = partial(self.design_filter, name, output="zpk")
+        return entry
+
+    def select_filter(self, filter_name):
+        """Replace the z-plane roots with the design of a library filter."""
+        self.filter_selection = filter_name
+        self.load_selected_filter()
+
+    def load_selected_filter(self):
+        """
+        Load the zeros, poles and gain of `filter_selection` as one undoable
+        step, with the all-pass selection stored alongside a saved design.
+        """
+        self._load_design()
+        self.commit()
+
+    def _load_design(self):
+        """Load `filter_selection` into the pending step, without committing it."""
+        if self.filter_selection == "None":
+            self.root_index.clear()
+            self.set_gain(1.0)
+        else:
+            with perf_monitor.stage("zplane.design"):
+                # Designs come out in zero-pole-gain form, so no polynomial roots are needed
+                zeros, poles, gain = self.filter_library[self.filter_selection]()
+                self.zeros = list(zeros)
+                self.poles = list(poles)
+                self.set_gain(gain)
+            if self.filter_selection not in self.filter_specs:
+                all_pass = _sections(self.saved_filters.load(self.filter_selection)["all_pass"])
+                self._record_all_pass(all_pass, bool(all_pass))
+
+    # Roots and gain
+
+    @property
+    def zeros(self):
+        """Current zeros, in the order they were added."""
+        return self.root_index.values("zero")
+
+    @zeros.setter
+    def zeros(self, values):
+        self.root_index.replace("zero", values)
+
+    @property
+    def poles(self):
+        """Current poles, in the order they were added."""
+        return self.root_index.values("pole")
+
+    @poles.setter
+    def poles(self, values):
+        self.root_index.replace("pole", values)
+
+    def add_root(self, value, kind, conjugate=False):
+        """Add a zero or pole, and its conjugate when `conjugate` is set and it is not real."""
+        value = complex(value)
+        self.root_index.insert(value, kind)
+        if conjugate and value.imag != 0:
+            self.root_index.insert(value.conjugate(), kind)
+        self.commit()
+
+    def remove_nearest(self, value):
+        """Remove the zero or pole closest to `value`; returns False when there is none."""
+        closest = self.root_index.nearest(complex(value))
+        if closest is None:
+            return False
+        self.root_index.remove(closest)
+        self.commit()
+        return True
+
+    def find_root(self, value, max_distance):
+        """Id of the zero or pole within `max_distance` of `value` and of its conjugate partner (or None)."""
+        root_id = self.root_index.nearest(complex(value), max_distance=max_distance)
+        if root_id is None:
+            return None
+
+        root = self.root_index.value(root_id)
+        conjugate_id = None
+        if root.imag != 0:
+            conjugate_id = self.root_index.nearest(
+                np.conj(root), kinds=(self.root_index.kind(root_id),),
+                max_distance=1e-9 * max(1.0, abs(root)), exclude=(root_id,)
+            )
+        return root_id, conjugate_id
+
+    def move_root(self, root_id, value, conjugate_id=None):
+        """Move one root, and its conjugate partner to the mirrored position (committed by the caller)."""
+        value = complex(value)
+        self.root_index.move(root_id, value)
+        if conjugate_id is not None:
+            self.root_index.move(conjugate_id, value.conjugate())
+
+    def set_gain(self, gain):
+        """Change the gain of the model as an undoable edit of the pending step; it must be real."""
+        gain = np.real_if_close(gain)
+        if np.iscomplexobj(gain):
+            raise ValueError(f"The gain must be real, got {complex(gain)}")
+        gain = float(gain)
+        if gain != self.gain:
+            self.record(("gain", self.gain, gain))
+            self.gain = gain
+
+    def clear(self, kind=None):
+        """Remove every zero, every pole, or (with no kind) everything and reset the gain."""
+        self.root_index.clear(kind)
+        if kind is None:
+            self.set_gain(1.0)
+        self.commit()
+
+    def swap_zeros_poles(self):
+        self.root_index.swap_kinds()
+        self.commit()
+
+    # All-pass sections
+
+    def all_pass_state(self):
+        """The selected all-pass sections and whether they are applied."""
+        return tuple(self.selected_all_pass_filters), self.all_pass_enabled
+
+    def set_all_pass_state(self, state):
+        """Restore `all_pass_state()` output without recording it as a new edit."""
+        selected, enabled = state
+        self.selected_all_pass_filters = list(selected)
+        self.all_pass_enabled = enabled
+        self.recorded_all_pass_state = state
+        self.coefficients_version += 1
+
+    def set_all_pass(self, selected=None, enabled=None):
+        """
+        Change the selected sections and/or whether they are applied, as one
+        undoable step. Returns False when nothing changed.
+        """
+        changed = self._record_all_pass(selected, enabled)
+        self.commit()
+        return changed
+
+    def _record_all_pass(self, selected=None, enabled=None):
+        """Record an all-pass change in the pending step, without committing it."""
+        if selected is not None:
+            self.selected_all_pass_filters = list(selected)
+        if enabled is not None:
+            self.all_pass_enabled = enabled
+        state = self.all_pass_state()
+        if state == self.recorded_all_pass_state:
+            return False
+        self.record(("all_pass", self.recorded_all_pass_state, state))
+        self.recorded_all_pass_state = state
+        return True
+
+    def add_custom_all_pass(self, zeros):
+        """Apply the all-pass section with the given zeros (and poles mirrored at 1 / conj) as "Custom"."""
+        zeros = [complex(zero) for zero in zeros]
+        section = {'zeros': zeros, 'poles': [1 / zero.conjugate() for zero in zeros]}
+        self.all_pass_filter_library["Custom"] = section
+        self.set_all_pass([section], True)
+        return section
+
+    def sweep_all_pass(self, metric="group_delay", top=10, **options):
+        """Rank every library filter combined with every subset of the all-pass library (see sweep_all_pass)."""
+        from app.services.all_pass_sweep import sweep_all_pass  # Imported on first use: it pulls in multiprocessing
+
+        bases = {name: self.design_filter(name, output="zpk") for name in self.filter_library if name != "None"}
+        with perf_monitor.stage("zplane.all_pass_sweep"):
+            return sweep_all_pass(bases, self.all_pass_filter_library, metric=metric, top=top, **options)
+
+    def apply_sweep_result(self, result):
+        """Load the base filter of a sweep result with its all-pass sections, as one undoable step."""
+        self.filter_selection = result["filter"]
+        self._load_design()
+        self._record_all_pass([self.all_pass_filter_library[name] for name in result["all_pass"]], True)
+        self.commit()
+
+    def equalize_phase(self, n_sections=4, band=None):
+        """
+        Design `n_sections` all-pass sections that flatten the group delay of
+        the z-plane filter over `band` (its passband by default) and apply them.
+        """
+        from app.services.phase_equalizer import equalize_group_delay  # Imported on first use, like the sweep
+
+        with perf_monitor.stage("zplane.equalize_phase"):
+            result = equalize_group_delay(self.zeros, self.poles, n_sections, band=band)
+
+        # The sections replace those of an earlier equalization in the library
+        for name in [name for name in self.all_pass_filter_library if name.startswith("Equalizer ")]:
+            del self.all_pass_filter_library[name]
+        for index, section in enumerate(result["sections"], start=1):
+            self.all_pass_filter_library[f"Equalizer {index}"] = section
+
+        self.set_all_pass(result["sections"], True)
+        return result
+
+    # Derived quantities
+
+    def cached_form(self, form, build):
+        """Return the `form` conversion of the current filter, building it once per coefficients version."""
+        if self.coefficient_cache_version != self.coefficients_version:
+            self.coefficient_cache.clear()
+            self.coefficient_cache_version = self.coefficients_version
+        if form not in self.coefficient_cache:
+            self.coefficient_cache[form] = build()
+        return self.coefficient_cache[form]
+
+    def combined_roots(self):
+        """Zeros and poles of the z-plane filter plus the applied all-pass sections, as tuples."""
+        def build():
+            zeros, poles = self.zeros, self.poles
+            if self.all_pass_enabled:
+                for section in self.selected_all_pass_filters:
+                    zeros.extend(section['zeros'])
+                    poles.extend(section['poles'])
+            return tuple(zeros), tuple(poles)  # Shared through the cache, so callers cannot modify them
+        return self.cached_form("roots", build)
+
+    def get_filter_zpk(self):
+        """The effective filter (z-plane roots plus applied all-pass sections) as zeros, poles and gain."""
+        if not len(self.root_index):
+            return np.array([], dtype=complex), np.array([], dtype=complex), 1.0  # Default: No filtering
+        zeros, poles = self.combined_roots()
+        return np.array(zeros, dtype=complex), np.array(poles, dtype=complex), self.gain
+
+    def get_filter_coefficients(self):
+        """Get transfer-function coefficients b, a of the current filter (built only when asked for)."""
+        def build():
+            zeros, poles, gain = self.get_filter_zpk()
+            b = np.atleast_1d(np.real_if_close(gain * np.poly(zeros)))  # Numerator coefficients
+            a = np.atleast_1d(np.real_if_close(np.poly(poles)))  # Denominator coefficients
+            return b, a
+        return self.cached_form("ba", build)
+
+    def get_filter_sos(self):
+        """Get the current filter as a cascade of second-order sections."""
+        return self.cached_form("sos", lambda: roots_to_sos(*self.get_filter_zpk()))
+
+    def frequency_response(self, view="phase"):
+        """
+        Frequencies (rad/sample), magnitude and `view` ("phase",
+        "unwrapped_phase" or "group_delay") of the effective filter, or None
+        when there are no roots.
+        """
+        if not len(self.root_index):
+            return None
+        zeros, poles = self.combined_roots()
+        # Only the roots that changed since the last call are applied to the factored response
+        with perf_monitor.stage("zplane.frequency_response"):
+            self.response.update_roots(zeros, poles, self.gain)
+        return self.response.w, self.response.magnitude(), getattr(self.response, view)()
+
+    def refine_response(self):
+        """Re-sum the frequency response from scratch, dropping accumulated rounding error."""
+        self.response.recompute()
+
+    # Undo/redo
+
+    def undo(self):
+        """Undo the last step; returns False when there is nothing to undo."""
+        return self.history.undo()
+
+    def redo(self):
+        """Redo the last undone step; returns False when there is nothing to redo."""
+        return self.history.redo()
+
+    def apply_history_delta(self, delta, inverse):
+        """Replay (or revert) one recorded edit."""
+        if delta[0] == "all_pass":
+            self.set_all_pass_state(delta[1] if inverse else delta[2])
+        elif delta[0] == "gain":
+            self.gain = delta[1] if inverse else delta[2]
+        else:
+            self.root_index.apply(delta, inverse)
+        self.coefficients_version += 1
+
+    def history_snapshot(self):
+        return {"roots": self.root_index.snapshot(), "all_pass": self.all_pass_state(), "gain": self.gain}
+
+    def restore_history_snapshot(self, snapshot):
+        self.root_index.restore(snapshot["roots"])
+        self.gain = snapshot["gain"]
+        self.set_all_pass_state(snapshot["all_pass"])
+
+    # Files
+
+    def save_file(self, filepath):
+        """Save the roots to CSV, or to .npz together with the gain and all-pass selection."""
+        if filepath.endswith(".npz"):
+            write_filter_npz(filepath, self.zeros, self.poles, self.gain, all_pass=self.selected_all_pass_filters,
+                             metadata={"family": "custom"})
+        else:
+            write_filter_csv(filepath, self.zeros, self.poles)
+
+    def load_file(self, filepath):
+        """Load a design written by `save_file` as one undoable step."""
+        if filepath.endswith(".npz"):
+            stored = read_filter_npz(filepath)
+            self.set_gain(stored["gain"])  # Checked first, so an invalid file leaves the roots alone
+            self.zeros, self.poles = stored["zeros"], stored["poles"]  # Bulk insert into the index
+            all_pass = _sections(stored["all_pass"])
+            self._record_all_pass(all_pass, bool(all_pass))
+        else:
+            zeros, poles = read_filter_csv(filepath)
+            self.zeros, self.poles = zeros, poles  # Bulk insert into the index
+            self.set_gain(1.0)  # The CSV format stores roots only
+        self.commit()
+
+    def export_c(self, directory, precision="float", name="digital_filter"):
+        """Write the current design as a C biquad cascade (with a benchmark harness) into a directory."""
+        return export_c(self.get_filter_sos(), directory, name=name, precision=precision, harness=True)
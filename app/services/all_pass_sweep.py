@@ -0,0 +1,126 @@
+"""
+Rank every base filter combined with every subset of the all-pass library.
+
+Phase and group delay are sums of per-root terms, so each all-pass section
+is evaluated once on the frequency grid and a subset's response is the base
+response plus one indicator-matrix product. Subsets are scored in chunks of
+`chunk_size` rows, and base filters are spread over a process pool. Qt-free.
+"""
+import heapq
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.services.frequency_response import root_group_delay, root_log_magnitude, root_phase
+
+SWEEP_METRICS = {
+    "group_delay": "Group-delay spread (samples)",
+    "phase": "Phase nonlinearity (rad)",
+}
+
+
+def passband_mask(zeros, poles, w, edge_db=-3.0):
+    """Grid points where the magnitude is within `edge_db` of its peak."""
+    log_magnitude = root_log_magnitude(zeros, w) - root_log_magnitude(poles, w)
+    return log_magnitude >= log_magnitude.max() + edge_db * np.log(10) / 20
+
+
+def count_subsets(n_sections, max_sections=None):
+    limit = n_sections if max_sections is None else min(max_sections, n_sections)
+    return sum(math.comb(n_sections, size) for size in range(limit + 1))
+
+
+def iter_subsets(n_sections, max_sections=None):
+    """Every subset of section indices, smallest first, as tuples."""
+    limit = n_sections if max_sections is None else min(max_sections, n_sections)
+    for size in range(limit + 1):
+        yield from itertools.combinations(range(n_sections), size)
+
+
+def metric_terms(roots, w, metric):
+    """Per-root quantity the metric is computed from: group delay or unwrapped phase."""
+    return root_group_delay(roots, w) if metric == "group_delay" else root_phase(roots, w)
+
+
+def score_rows(values, w, metric):
+    """
+    Score each row of passband group delay or unwrapped phase (lower is better).
+
+    "group_delay" is the standard deviation of the group delay; "phase" is
+    the RMS residual of a least-squares line fitted to the phase.
+    """
+    if metric == "group_delay":
+        return values.std(axis=1)
+    if metric == "phase":
+        design = np.column_stack([np.ones_like(w), w])
+        fitted = (values @ np.linalg.pinv(design).T) @ design.T
+        return np.sqrt(np.mean((values - fitted) ** 2, axis=1))
+    raise ValueError(f"Unknown sweep metric: {metric}")
+
+
+def _sweep_job(job):
+    """Best `top` subsets for one base filter: [(score, name, section indices)]."""
+    name, zeros, poles, sections, metric, top, max_sections, n_points, chunk_size = job
+    w = np.linspace(0, np.pi, n_points, endpoint=False)
+    mask = passband_mask(zeros, poles, w)
+    w = w[mask]
+    if not len(w):
+        return []
+
+    # Terms add up over sections, so a subset is one row of indicator @ section_terms
+    base_terms = metric_terms(zeros, w, metric) - metric_terms(poles, w, metric)
+    section_terms = np.array([metric_terms(z, w, metric) - metric_terms(p, w, metric)
+                              for z, p in sections]).reshape(-1, len(w))
+
+    best = []
+    subsets = iter_subsets(len(sections), max_sections)
+    while True:
+        chunk = list(itertools.islice(subsets, chunk_size))
+        if not chunk:
+            break
+        indicator = np.zeros((len(chunk), len(sections)))
+        for row, subset in enumerate(chunk):
+            indicator[row, list(subset)] = 1.0
+        scores = score_rows(base_terms + indicator @ section_terms, w, metric)
+        keep = np.argsort(scores)[:top] if len(scores) <= top else np.argpartition(scores, top)[:top]
+        best = heapq.nsmallest(top, best + [(float(scores[i]), name, chunk[i]) for i in keep])
+    return best
+
+
+def sweep_all_pass(bases, all_pass_library, metric="group_delay", top=10, max_sections=None, n_points=512,
+                   jobs=None, chunk_size=4096, max_subsets=1 << 16):
+    """
+    Rank every (base filter, all-pass subset) combination by `metric`.
+
+    `bases` maps names to (zeros, poles, gain) and `all_pass_library` maps
+    names to {'zeros': ..., 'poles': ...} as in ZPlaneController. Only the
+    passband of each base filter (within 3 dB of its peak) is scored. Base
+    filters are spread over a process pool with `jobs` workers (one per
+    core by default). Returns the `top` results, best first, as dicts with
+    "filter", "all_pass" (section names) and "score".
+    """
+    if metric not in SWEEP_METRICS:
+        raise ValueError(f"Unknown sweep metric: {metric}")
+    section_names = list(all_pass_library)
+    n_subsets = count_subsets(len(section_names), max_sections)
+    if n_subsets > max_subsets:
+        raise ValueError(f"{n_subsets} all-pass subsets per filter; limit the sweep with max_sections")
+
+    sections = [(np.asarray(all_pass_library[name]["zeros"], dtype=complex),
+                 np.asarray(all_pass_library[name]["poles"], dtype=complex)) for name in section_names]
+    work = [(name, np.asarray(zeros, dtype=complex), np.asarray(poles, dtype=complex), sections, metric, top,
+             max_sections, n_points, chunk_size) for name, (zeros, poles, _) in bases.items()]
+
+    jobs = jobs or os.cpu_count()
+    if jobs == 1 or len(work) <= 1:
+        results = list(map(_sweep_job, work))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+            results = list(pool.map(_sweep_job, work))
+
+    ranked = heapq.nsmallest(top, itertools.chain.from_iterable(results))
+    return [{"filter": name, "all_pass": [section_names[i] for i in subset], "score": score}
+            for score, name, subset in ranked]
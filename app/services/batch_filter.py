@@ -0,0 +1,219 @@
+"""
+Offline filtering of recorded signals, without any Qt dependency.
+
+Signals are streamed through a StreamingFilter in fixed-size chunks with the
+filter state carried across chunk boundaries, so the output is the same as
+filtering the whole signal at once while only one chunk is held in memory.
+
+With ``mmap=True``, .npy and raw inputs are mapped with np.memmap and the
+result is written straight into an output memmap, which handles files far
+larger than RAM. Because sosfilt carries exactly the per-section state it
+would hold mid-way through a single call, float64 outputs are bit-for-bit
+identical to one `sosfilt` call over the whole signal, for any chunk size.
+Raw outputs of a narrower dtype (e.g. float32) differ from the float64
+result only by the final rounding, at most half an ulp of that dtype.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from app.services.sos_filter import roots_to_sos
+from app.services.streaming_filter import StreamingFilter
+from app.utils.filter_io import read_filter_csv, read_filter_npz
+
+RAW_EXTENSIONS = (".raw", ".bin", ".f32", ".f64")
+
+
+def signal_format(path):
+    """Infer the signal file format ("csv", "npy" or "raw") from its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension == ".npy":
+        return "npy"
+    if extension in RAW_EXTENSIONS:
+        return "raw"
+    raise ValueError(f"Unsupported signal file: {path}")
+
+
+def iter_csv_chunks(path, chunk_size, column=0):
+    """Yield one column of a numeric CSV file in chunks, skipping a header row if present."""
+    with open(path, 'r') as file:
+        first = True
+        while True:
+            lines = list(itertools.islice(file, chunk_size))
+            if not lines:
+                return
+            if first:
+                first = False
+                try:
+                    float(lines[0].split(',')[column])
+                except ValueError:
+                    lines = lines[1:]  # Header row
+                    if not lines:
+                        continue
+            yield np.loadtxt(lines, delimiter=',', usecols=column, ndmin=1, dtype=np.float64)
+
+
+def iter_npy_chunks(path, chunk_size):
+    """Yield a 1-D .npy array in chunks."""
+    data = np.load(path, mmap_mode='r')
+    if data.ndim != 1:
+        raise ValueError(f"{path}: expected a 1-D signal, got shape {data.shape}")
+    for start in range(0, len(data), chunk_size):
+        yield np.asarray(data[start:start + chunk_size], dtype=np.float64)
+
+
+def iter_raw_chunks(path, chunk_size, dtype=np.float64):
+    """Yield a headerless binary file of `dtype` samples in chunks."""
+    dtype = np.dtype(dtype)
+    with open(path, 'rb') as file:
+        while True:
+            chunk = np.fromfile(file, dtype=dtype, count=chunk_size)
+            if chunk.size == 0:
+                return
+            yield chunk.astype(np.float64)
+
+
+class SignalWriter:
+    """Append filtered chunks to an output file in the same format as the input."""
+
+    def __init__(self, path, fmt, length=None, dtype=np.float64):
+        self.path = path
+        self.format = fmt
+        self.dtype = np.dtype(dtype)
+        self.file = open(path, 'w' if fmt == "csv" else 'wb')
+        if fmt == "npy":
+            # The header needs the final length, known up front for .npy inputs
+            header = {"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False, "shape": (length,)}
+            np.lib.format.write_array_header_1_0(self.file, header)
+
+    def write(self, chunk):
+        if self.format == "csv":
+            np.savetxt(self.file, chunk, delimiter=',')
+        else:
+            chunk.astype(self.dtype).tofile(self.file)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def output_path(path, output_dir, suffix="_filtered"):
+    """Output file name for `path`: same name and extension with a suffix, in `output_dir`."""
+    stem, extension = os.path.splitext(os.path.basename(path))
+    return os.path.join(output_dir or os.path.dirname(path), f"{stem}{suffix}{extension}")
+
+
+def filter_file(sos, in_path, out_path, chunk_size=65536, dtype=np.float64, column=0, mmap=False):
+    """Filter one signal file chunk by chunk, carrying the filter state, and return the sample count."""
+    fmt = signal_format(in_path)
+    if mmap and fmt != "csv":
+        return filter_file_memmap(sos, in_path, out_path, chunk_size, dtype)
+    engine = StreamingFilter()
+    engine.set_sos(sos)
+
+    length = None
+    if fmt == "csv":
+        chunks = iter_csv_chunks(in_path, chunk_size, column)
+    elif fmt == "npy":
+        length = len(np.load(in_path, mmap_mode='r'))
+        chunks = iter_npy_chunks(in_path, chunk_size)
+    else:
+        chunks = iter_raw_chunks(in_path, chunk_size, dtype)
+
+    n_samples = 0
+    with SignalWriter(out_path, fmt, length, dtype if fmt == "raw" else np.float64) as writer:
+        for chunk in chunks:
+            writer.write(engine.process(chunk))
+            n_samples += len(chunk)
+    return n_samples
+
+
+def open_signal_memmap(path, dtype=np.float64):
+    """Map a .npy or raw signal file read-only without loading it."""
+    if signal_format(path) == "npy":
+        data = np.load(path, mmap_mode='r')
+    else:
+        data = np.memmap(path, dtype=np.dtype(dtype), mode='r')
+    if data.ndim != 1:
+        raise ValueError(f"{path}: expected a 1-D signal, got shape {data.shape}")
+    return data
+
+
+def create_output_memmap(path, length, dtype=np.float64):
+    """Create a writable .npy or raw memmap of `length` samples."""
+    if signal_format(path) == "npy":
+        return np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(length,))
+    return np.memmap(path, dtype=np.dtype(dtype), mode='w+', shape=(length,))
+
+
+def filter_memmap(sos, source, destination, chunk_size=65536, flush_every=64):
+    """
+    Filter `source` into `destination` (arrays or memmaps of equal length) chunk by chunk.
+
+    Only one chunk is converted and filtered at a time, and the output map is
+    flushed every `flush_every` chunks so dirty pages do not pile up, keeping
+    peak memory bounded by the chunk size rather than the file size.
+    """
+    engine = StreamingFilter()
+    engine.set_sos(sos)
+    for index, start in enumerate(range(0, len(source), chunk_size)):
+        stop = start + chunk_size
+        destination[start:stop] = engine.process(source[start:stop])
+        if hasattr(destination, "flush") and (index + 1) % flush_every == 0:
+            destination.flush()
+    if hasattr(destination, "flush"):
+        destination.flush()
+    return len(source)
+
+
+def filter_file_memmap(sos, in_path, out_path, chunk_size=65536, dtype=np.float64):
+    """Filter a .npy or raw file into an output file of the same format through memmaps."""
+    source = open_signal_memmap(in_path, dtype)
+    destination = create_output_memmap(out_path, len(source), dtype)
+    n_samples = filter_memmap(sos, source, destination, chunk_size)
+    del destination  # Close the output map
+    return n_samples
+
+
+def _filter_job(job):
+    sos, in_path, out_path, options = job
+    return in_path, out_path, filter_file(sos, in_path, out_path, **options)
+
+
+def filter_files(filter_path, in_paths, output_dir=None, jobs=None, gain=1.0, **options):
+    """
+    Filter many signal files with the design saved at `filter_path`.
+
+    Files are spread over a process pool with `jobs` workers (one per core
+    by default). Yields ``(in_path, out_path, n_samples)`` as files finish,
+    which need not be the order of `in_paths`.
+    """
+    if filter_path.endswith(".npz"):
+        # The binary format also stores the gain and the all-pass sections saved with the design
+        stored = read_filter_npz(filter_path)
+        zeros = np.concatenate([stored["zeros"]] + [section["zeros"] for section in stored["all_pass"]])
+        poles = np.concatenate([stored["poles"]] + [section["poles"] for section in stored["all_pass"]])
+        gain = gain * stored["gain"]
+    else:
+        zeros, poles = read_filter_csv(filter_path)
+    sos = roots_to_sos(zeros, poles, gain)
+    work = [(sos, path, output_path(path, output_dir), options) for path in in_paths]
+
+    if jobs == 1 or len(work) == 1:
+        for job in work:
+            yield _filter_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_filter_job, job) for job in work]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,362 @@
+"""
+Export a second-order-section cascade as portable C99.
+
+The generated filter is a cascade of transposed Direct Form II biquads
+processed a block at a time: each section runs over the whole block
+before the next one starts, so its coefficients and state stay in
+registers. Four sample types are supported:
+
+    float, double  floating point, filtered in place in the output buffer
+    q15            int16_t samples and coefficients, 64-bit internal state
+    q31            int32_t samples and coefficients, 64-bit internal state
+
+Fixed-point sections carry their own coefficient scaling (a right shift),
+and intermediate signals are kept in an int64 work buffer at Q31 scale;
+outputs are rounded and saturated. Q31 coefficients keep at most 24
+fractional bits so that the 64-bit products leave headroom for sections
+whose gain peaks well above full scale.
+"""
+import math
+import os
+
+import numpy as np
+
+# C types per precision; fixed-point entries also give the word size, the most fractional bits a
+# coefficient may use and the left shift that brings samples to the Q31 scale of the work buffer
+PRECISIONS = {
+    "float": {"sample": "float", "coefficient": "float", "suffix": "f"},
+    "double": {"sample": "double", "coefficient": "double", "suffix": ""},
+    "q15": {"sample": "int16_t", "coefficient": "int16_t", "bits": 16, "max_fraction": 14, "input_shift": 16},
+    "q31": {"sample": "int32_t", "coefficient": "int32_t", "bits": 32, "max_fraction": 24, "input_shift": 0},
+}
+
+BLOCK_SIZE = 256
+
+
+def _identifier(name):
+    identifier = "".join(c if c.isalnum() else "_" for c in name).strip("_").lower() or "digital_filter"
+    return identifier if not identifier[0].isdigit() else f"filter_{identifier}"
+
+
+def _real_sections(sos):
+    """`sos` as a real 2-D array; complex sections (from unpaired complex roots) cannot be exported."""
+    sos = np.atleast_2d(np.asarray(sos))
+    if np.iscomplexobj(sos):
+        if np.any(sos.imag != 0):
+            raise ValueError("The filter has complex coefficients: every complex zero and pole "
+                             "needs its conjugate before it can be exported to C")
+        sos = sos.real
+    return sos.astype(float)
+
+
+def _biquad_rows(sos):
+    """Rows of (b0, b1, b2, a1, a2) with every section normalized to a0 == 1."""
+    sos = _real_sections(sos)
+    return sos[:, [0, 1, 2, 4, 5]] / sos[:, 3:4]
+
+
+def quantize_sections(sos, precision):
+    """Integer coefficients and per-section right shifts for a fixed-point precision."""
+    spec = PRECISIONS[precision]
+    rows = _biquad_rows(sos)
+    coefficients, shifts = [], []
+    limit = 2 ** (spec["bits"] - 1) - 1
+    for row in rows:
+        # Integer bits needed by the largest coefficient of this section, keeping one bit of margin
+        largest = max(np.max(np.abs(row)), 1e-12)
+        integer_bits = max(0, math.floor(math.log2(largest)) + 1)
+        fraction = min(spec["max_fraction"], spec["bits"] - 1 - integer_bits)
+        if fraction < 1:
+            raise ValueError(f"Coefficient {largest:g} is too large for {precision}")
+        coefficients.append(np.clip(np.round(row * 2.0 ** fraction), -limit - 1, limit).astype(np.int64))
+        shifts.append(fraction)
+    return np.array(coefficients), np.array(shifts)
+
+
+def _format_float(value, suffix):
+    return repr(float(value)) + suffix  # repr round-trips and always has a '.' or an exponent
+
+
+def generate_header(name, n_sections, precision):
+    spec = PRECISIONS[precision]
+    ident, guard = _identifier(name), _identifier(name).upper()
+    state_type = "int64_t" if precision.startswith("q") else spec["sample"]
+    return f"""/* {ident}: {n_sections}-section biquad cascade ({precision}), generated by the Digital Filter Application */
+#ifndef {guard}_H
+#define {guard}_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+#define {guard}_SECTIONS {n_sections}
+
+typedef struct {{
+    {state_type} s1[{guard}_SECTIONS];
+    {state_type} s2[{guard}_SECTIONS];
+}} {ident}_state;
+
+/* Clear the delay lines. */
+void {ident}_init({ident}_state *state);
+
+/* Filter `length` samples; `output` may alias `input`. State carries over between calls. */
+void {ident}_process({ident}_state *state, const {spec["sample"]} *input, {spec["sample"]} *output, size_t length);
+
+#endif /* {guard}_H */
+"""
+
+
+def _float_source(name, sos, precision):
+    spec = PRECISIONS[precision]
+    ident, guard = _identifier(name), _identifier(name).upper()
+    t, suffix = spec["sample"], spec["suffix"]
+    rows = ",\n".join("    {" + ", ".join(_format_float(c, suffix) for c in row) + "}" for row in _biquad_rows(sos))
+    return f"""#include <string.h>
+
+#include "{ident}.h"
+
+/* b0, b1, b2, a1, a2 per section (a0 == 1) */
+static const {t} {ident}_coefficients[{guard}_SECTIONS][5] = {{
+{rows}
+}};
+
+void {ident}_init({ident}_state *state)
+{{
+    memset(state, 0, sizeof(*state));
+}}
+
+void {ident}_process({ident}_state *state, const {t} *input, {t} *output, size_t length)
+{{
+    size_t n;
+    int k;
+
+    for (k = 0; k < {guard}_SECTIONS; k++) {{
+        const {t} b0 = {ident}_coefficients[k][0];
+        const {t} b1 = {ident}_coefficients[k][1];
+        const {t} b2 = {ident}_coefficients[k][2];
+        const {t} a1 = {ident}_coefficients[k][3];
+        const {t} a2 = {ident}_coefficients[k][4];
+        const {t} *x = (k == 0) ? input : output;
+        {t} s1 = state->s1[k];
+        {t} s2 = state->s2[k];
+
+        /* Transposed Direct Form II */
+        for (n = 0; n < length; n++) {{
+            const {t} xn = x[n];
+            const {t} yn = b0 * xn + s1;
+            s1 = b1 * xn - a1 * yn + s2;
+            s2 = b2 * xn - a2 * yn;
+            output[n] = yn;
+        }}
+        state->s1[k] = s1;
+        state->s2[k] = s2;
+    }}
+}}
+"""
+
+
+def _fixed_source(name, sos, precision):
+    spec = PRECISIONS[precision]
+    ident, guard = _identifier(name), _identifier(name).upper()
+    t, c = spec["sample"], spec["coefficient"]
+    coefficients, shifts = quantize_sections(sos, precision)
+    rows = ",\n".join("    {" + ", ".join(str(int(v)) for v in row) + "}" for row in coefficients)
+    sample_max = 2 ** (spec["bits"] - 1) - 1
+    input_shift = spec["input_shift"]
+    if input_shift:
+        to_output = f"(work[n] + ((int64_t)1 << {input_shift - 1})) >> {input_shift}"
+    else:
+        to_output = "work[n]"
+    return f"""#include <string.h>
+
+#include "{ident}.h"
+
+#define {guard}_BLOCK_SIZE {BLOCK_SIZE}
+
+/* b0, b1, b2, a1, a2 per section (a0 == 1), each section scaled by 2^{ident}_shifts[k] */
+static const {c} {ident}_coefficients[{guard}_SECTIONS][5] = {{
+{rows}
+}};
+
+static const int {ident}_shifts[{guard}_SECTIONS] = {{{", ".join(str(int(s)) for s in shifts)}}};
+
+/* Rounded (c * x) / 2^shift; relies on arithmetic right shifts of negative values, as on gcc and clang */
+static int64_t {ident}_multiply(int64_t c, int64_t x, int shift)
+{{
+    return (c * x + ((int64_t)1 << (shift - 1))) >> shift;
+}}
+
+void {ident}_init({ident}_state *state)
+{{
+    memset(state, 0, sizeof(*state));
+}}
+
+void {ident}_process({ident}_state *state, const {t} *input, {t} *output, size_t length)
+{{
+    int64_t work[{guard}_BLOCK_SIZE];  /* Intermediate signal at Q31 scale */
+    size_t start, count, n;
+    int k;
+
+    for (start = 0; start < length; start += count) {{
+        count = length - start < {guard}_BLOCK_SIZE ? length - start : {guard}_BLOCK_SIZE;
+        for (n = 0; n < count; n++) {{
+            work[n] = (int64_t)input[start + n] * ((int64_t)1 << {input_shift});
+        }}
+
+        for (k = 0; k < {guard}_SECTIONS; k++) {{
+            const int64_t b0 = {ident}_coefficients[k][0];
+            const int64_t b1 = {ident}_coefficients[k][1];
+            const int64_t b2 = {ident}_coefficients[k][2];
+            const int64_t a1 = {ident}_coefficients[k][3];
+            const int64_t a2 = {ident}_coefficients[k][4];
+            const int shift = {ident}_shifts[k];
+            int64_t s1 = state->s1[k];
+            int64_t s2 = state->s2[k];
+
+            /* Transposed Direct Form II */
+            for (n = 0; n < count; n++) {{
+                const int64_t xn = work[n];
+                const int64_t yn = {ident}_multiply(b0, xn, shift) + s1;
+                s1 = {ident}_multiply(b1, xn, shift) - {ident}_multiply(a1, yn, shift) + s2;
+                s2 = {ident}_multiply(b2, xn, shift) - {ident}_multiply(a2, yn, shift);
+                work[n] = yn;
+            }}
+            state->s1[k] = s1;
+            state->s2[k] = s2;
+        }}
+
+        for (n = 0; n < count; n++) {{
+            int64_t y = {to_output};
+            if (y > {sample_max}) y = {sample_max};
+            if (y < -{sample_max} - 1) y = -{sample_max} - 1;
+            output[start + n] = ({t})y;
+        }}
+    }}
+}}
+"""
+
+
+def generate_source(name, sos, precision="float"):
+    """C source implementing the cascade `sos` for one of `PRECISIONS`."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+    if precision.startswith("q"):
+        return _fixed_source(name, sos, precision)
+    return _float_source(name, sos, precision)
+
+
+def generate_harness(name, precision="float"):
+    """C program that times the exported filter and writes its output for comparison."""
+    spec = PRECISIONS[precision]
+    ident = _identifier(name)
+    t = spec["sample"]
+    if precision.startswith("q"):
+        scale = float(2 ** (spec["bits"] - 1))
+        limit = 2 ** (spec["bits"] - 1) - 1
+        to_sample = (f"double v = floor(values[n] * {scale:.1f} + 0.5);\n"
+                     f"        if (v > {limit}.0) v = {limit}.0;\n"
+                     f"        if (v < -{limit + 1}.0) v = -{limit + 1}.0;\n"
+                     f"        samples[n] = ({t})v;")
+        to_double = f"values[n] = (double)result[n] / {scale:.1f};"
+    else:
+        to_sample = f"samples[n] = ({t})values[n];"
+        to_double = "values[n] = (double)result[n];"
+    return f"""#define _POSIX_C_SOURCE 199309L
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#include "{ident}.h"
+
+#define BLOCK 1024
+
+/* Usage: harness input.f64 output.f64 repeats */
+int main(int argc, char **argv)
+{{
+    FILE *file;
+    long bytes;
+    size_t length, n, start;
+    int repeats, r;
+    double *values, elapsed;
+    {t} *samples, *result;
+    {ident}_state state;
+    struct timespec begin, end;
+
+    if (argc != 4) {{
+        fprintf(stderr, "usage: %s input.f64 output.f64 repeats\\n", argv[0]);
+        return 2;
+    }}
+    repeats = atoi(argv[3]);
+
+    file = fopen(argv[1], "rb");
+    if (!file) {{
+        perror(argv[1]);
+        return 1;
+    }}
+    fseek(file, 0, SEEK_END);
+    bytes = ftell(file);
+    fseek(file, 0, SEEK_SET);
+    length = (size_t)bytes / sizeof(double);
+    values = malloc(length * sizeof(double));
+    samples = malloc(length * sizeof({t}));
+    result = malloc(length * sizeof({t}));
+    if (fread(values, sizeof(double), length, file) != length) {{
+        fprintf(stderr, "short read from %s\\n", argv[1]);
+        return 1;
+    }}
+    fclose(file);
+    for (n = 0; n < length; n++) {{
+        {to_sample}
+    }}
+
+    clock_gettime(CLOCK_MONOTONIC, &begin);
+    for (r = 0; r < repeats; r++) {{
+        {ident}_init(&state);
+        for (start = 0; start < length; start += BLOCK) {{
+            size_t count = length - start < BLOCK ? length - start : BLOCK;
+            {ident}_process(&state, samples + start, result + start, count);
+        }}
+    }}
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    elapsed = (double)(end.tv_sec - begin.tv_sec) + (double)(end.tv_nsec - begin.tv_nsec) * 1e-9;
+
+    for (n = 0; n < length; n++) {{
+        {to_double}
+    }}
+    file = fopen(argv[2], "wb");
+    if (!file) {{
+        perror(argv[2]);
+        return 1;
+    }}
+    fwrite(values, sizeof(double), length, file);
+    fclose(file);
+
+    printf("samples_per_second %.6e\\n", (double)length * repeats / elapsed);
+    free(values);
+    free(samples);
+    free(result);
+    return 0;
+}}
+"""
+
+
+def export_c(sos, directory, name="digital_filter", precision="float", harness=False):
+    """Write <name>.h and <name>.c (and harness.c when asked) into `directory`; returns the paths."""
+    sos = _real_sections(sos)
+    if not sos.size:
+        raise ValueError("At least one second-order section is needed")
+    ident = _identifier(name)
+    os.makedirs(directory, exist_ok=True)
+    files = {
+        f"{ident}.h": generate_header(name, len(sos), precision),
+        f"{ident}.c": generate_source(name, sos, precision),
+    }
+    if harness:
+        files["harness.c"] = generate_harness(name, precision)
+    paths = []
+    for file_name, text in files.items():
+        path = os.path.join(directory, file_name)
+        with open(path, "w") as file:
+            file.write(text)
+        paths.append(path)
+    return paths
@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _design_none(order, cutoff, btype, ripple, attenuation, output):
+    """Identity filter used by the "None" library entry."""
+    if output == "zpk":
+        return np.array([]), np.array([]), 1.0
+    if output == "sos":
+        return np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]])
+    return np.array([1.0]), np.array([1.0])
+
+
+def _signal():
+    """scipy.signal, imported on the first design so it stays off the startup path."""
+    from scipy import signal
+    return signal
+
+
+# Map each family name to a call that ignores the parameters it does not take
+DESIGN_FAMILIES = {
+    "none": _design_none,
+    "butter": lambda order, cutoff, btype, ripple, attenuation, output:
+        _signal().butter(order, cutoff, btype=btype, output=output),
+    "cheby1": lambda order, cutoff, btype, ripple, attenuation, output:
+        _signal().cheby1(order, ripple, cutoff, btype=btype, output=output),
+    "cheby2": lambda order, cutoff, btype, ripple, attenuation, output:
+        _signal().cheby2(order, attenuation, cutoff, btype=btype, output=output),
+    "ellip": lambda order, cutoff, btype, ripple, attenuation, output:
+        _signal().ellip(order, ripple, attenuation, cutoff, btype=btype, output=output),
+    "bessel": lambda order, cutoff, btype, ripple, attenuation, output:
+        _signal().bessel(order, cutoff, btype=btype, output=output),
+}
+
+
+def _freeze(value):
+    """Make a design result read-only so cached arrays cannot be modified by callers."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+        return value
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class FilterDesignCache:
+    """LRU cache of filter designs keyed on every parameter that affects the result."""
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.designs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.warm_thread = None
+
+    @staticmethod
+    def make_key(family, btype="low", order=4, cutoff=0.4, ripple=None, attenuation=None, output="ba"):
+        """Normalize design parameters into a hashable cache key."""
+        if np.ndim(cutoff):
+            cutoff = tuple(float(c) for c in cutoff)
+        else:
+            cutoff = float(cutoff)
+        ripple = None if ripple is None else float(ripple)
+        attenuation = None if attenuation is None else float(attenuation)
+        return family, btype, int(order), cutoff, ripple, attenuation, output
+
+    def design(self, family, btype="low", order=4, cutoff=0.4, ripple=None, attenuation=None, output="ba"):
+        """Return the cached design for these parameters, designing it on a miss."""
+        if family not in DESIGN_FAMILIES:
+            raise ValueError(f"Unknown filter family: {family}")
+        key = self.make_key(family, btype, order, cutoff, ripple, attenuation, output)
+
+        with self.lock:
+            if key in self.designs:
+                self.hits += 1
+                self.designs.move_to_end(key)
+                return self.designs[key]
+            self.misses += 1
+
+        # Design outside the lock so a slow design does not block lookups
+        family, btype, order, cutoff, ripple, attenuation, output = key
+        if isinstance(cutoff, tuple):
+            cutoff = list(cutoff)
+        result = _freeze(DESIGN_FAMILIES[family](order, cutoff, btype, ripple, attenuation, output))
+
+        with self.lock:
+            self.designs[key] = result
+            self.designs.move_to_end(key)
+            while len(self.designs) > self.max_size:
+                self.designs.popitem(last=False)  # Evict the least recently used design
+        return result
+
+    def warm(self, specs, background=True):
+        """Design every spec (a dict of `design` keyword arguments) ahead of time."""
+        specs = list(specs)
+
+        def run():
+            for spec in specs:
+                self.design(**spec)
+
+        if not background:
+            run()
+            return None
+        self.warm_thread = threading.Thread(target=run, name="filter-design-warmup", daemon=True)
+        self.warm_thread.start()
+        return self.warm_thread
+
+    def clear(self):
+        """Drop all cached designs and reset the statistics."""
+        with self.lock:
+            self.designs.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Return hit/miss statistics as a dict."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.designs),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
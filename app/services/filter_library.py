@@ -0,0 +1,165 @@
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from app.services.sos_filter import roots_to_sos
+from app.utils.filter_io import FILTER_FORMAT_VERSION, read_filter_metadata, read_filter_npz, write_filter_npz
+
+INDEX_FILE = "index.json"
+
+
+class FilterLibrary:
+    """
+    Directory of saved filters in the .npz format with a JSON index.
+
+    The index holds each filter's file name and metadata (family, order,
+    root counts...), so the library can be listed and searched without
+    opening the filter files; a file is only read when its design is
+    first requested, and then kept in memory.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.entries = {}  # name -> index entry
+        self.loaded = {}  # name -> read_filter_npz() result
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            self.read_index()
+        else:
+            self.rebuild_index()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def read_index(self):
+        with open(self.index_path) as file:
+            index = json.load(file)
+        self.entries = index["filters"]
+        self.loaded.clear()
+
+    def write_index(self):
+        """Write the index atomically, so a crash never leaves a truncated index behind."""
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"version": FILTER_FORMAT_VERSION, "filters": self.entries}, file, indent=1)
+        os.replace(temp_path, self.index_path)
+
+    def rebuild_index(self):
+        """Re-create the index from the metadata of every .npz file in the directory."""
+        self.entries = {}
+        for file_name in sorted(os.listdir(self.directory)):
+            if not file_name.endswith(".npz"):
+                continue
+            try:
+                _, metadata = read_filter_metadata(os.path.join(self.directory, file_name))
+            except (OSError, ValueError, KeyError) as error:
+                print(f"Skipping {file_name}: {error}")
+                continue
+            name = metadata.get("name", file_name[:-len(".npz")])
+            self.entries[name] = dict(metadata, name=name, file=file_name)
+        self.loaded.clear()
+        self.write_index()
+
+    def _file_name(self, name):
+        stem = re.sub(r"[^\w.-]+", "_", name).strip("._") or "filter"
+        taken = {entry["file"] for other, entry in self.entries.items() if other != name}
+        file_name, suffix = f"{stem}.npz", 1
+        while file_name in taken:
+            suffix += 1
+            file_name = f"{stem}_{suffix}.npz"
+        return file_name
+
+    def save(self, name, zeros, poles, gain=1.0, all_pass=(), family="custom", update_index=True, **metadata):
+        """Save a design under `name`, replacing any filter of that name, and update the index."""
+        zeros = np.asarray(zeros, dtype=complex)
+        poles = np.asarray(poles, dtype=complex)
+        all_pass = list(all_pass)
+        entry = dict(
+            metadata,
+            name=name,
+            family=family,
+            order=int(metadata.get("order", max(len(zeros), len(poles)))),
+            n_zeros=len(zeros),
+            n_poles=len(poles),
+            n_all_pass=len(all_pass),
+            saved=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+        previous = self.entries.get(name)
+        entry["file"] = previous["file"] if previous else self._file_name(name)
+        file_metadata = {key: value for key, value in entry.items() if key != "file"}
+        write_filter_npz(os.path.join(self.directory, entry["file"]), zeros, poles, gain,
+                         sos=roots_to_sos(zeros, poles, gain), all_pass=all_pass, metadata=file_metadata)
+        self.entries[name] = entry
+        self.loaded.pop(name, None)
+        if update_index:
+            self.write_index()
+        return entry
+
+    def save_many(self, designs):
+        """Save several designs (dicts of `save` arguments), writing the index once."""
+        entries = [self.save(update_index=False, **design) for design in designs]
+        self.write_index()
+        return entries
+
+    def remove(self, name):
+        entry = self.entries.pop(name)
+        self.loaded.pop(name, None)
+        path = os.path.join(self.directory, entry["file"])
+        if os.path.exists(path):
+            os.remove(path)
+        self.write_index()
+
+    def names(self):
+        return list(self.entries)
+
+    def search(self, family=None, order=None, min_order=None, max_order=None, text=None):
+        """Names of the filters matching every given criterion, from the index alone."""
+        matches = []
+        for name, entry in self.entries.items():
+            if family is not None and entry.get("family") != family:
+                continue
+            entry_order = entry.get("order", 0)
+            if order is not None and entry_order != order:
+                continue
+            if min_order is not None and entry_order < min_order:
+                continue
+            if max_order is not None and entry_order > max_order:
+                continue
+            if text is not None and text.lower() not in name.lower():
+                continue
+            matches.append(name)
+        return matches
+
+    def load(self, name):
+        """The stored filter `name` as a dict of arrays (see `read_filter_npz`)."""
+        if name not in self.loaded:
+            self.loaded[name] = read_filter_npz(os.path.join(self.directory, self.entries[name]["file"]))
+        return self.loaded[name]
+
+    def load_many(self, names=None):
+        """Load several filters (all of them by default) into memory and return them by name."""
+        return {name: self.load(name) for name in (self.entries if names is None else names)}
+
+    def design(self, name, output="ba"):
+        """Return a stored filter as ("ba") b, a, ("zpk") zeros, poles, gain or ("sos") sections."""
+        stored = self.load(name)
+        zeros, poles, gain = stored["zeros"], stored["poles"], stored["gain"]
+        if output == "zpk":
+            return zeros, poles, gain
+        if output == "sos":
+            return stored["sos"] if stored["sos"] is not None else roots_to_sos(zeros, poles, gain)
+        if output == "ba":
+            b = np.atleast_1d(np.real_if_close(gain * np.poly(zeros)))
+            a = np.atleast_1d(np.real_if_close(np.poly(poles)))
+            return b, a
+        raise ValueError(f"Unknown output format: {output}")
@@ -0,0 +1,342 @@
+from collections import Counter
+
+import numpy as np
+
+
+def root_terms(roots, w):
+    """
+    Log magnitude, unwrapped phase and group delay (in samples) of the
+    factor 1 - r e^-jw of each root, as three (len(roots), len(w)) arrays.
+
+    With u = r e^-jw, |1 - u|^2 = 1 - 2 Re(u) + |r|^2 and the group delay is
+    (|r|^2 - Re(u)) / |1 - u|^2, so everything follows from the real and
+    imaginary parts of u. The phase of a root outside the unit circle is
+    taken from -r e^-jw (1 - e^jw / r), which keeps every term continuous in
+    w without np.unwrap; only roots exactly on the circle still jump by pi
+    where the response is zero, and there the group delay uses its limit 1/2.
+    """
+    roots = np.atleast_1d(np.asarray(roots, dtype=complex))[:, None]
+    w = np.asarray(w)
+    x, y = roots.real, roots.imag
+    radius2 = x ** 2 + y ** 2
+    cos_w, sin_w = np.cos(w), np.sin(w)
+    u_real = x * cos_w + y * sin_w
+    u_imag = y * cos_w - x * sin_w
+    distance2 = 1 - 2 * u_real + radius2
+
+    # Clamp so a root exactly on the grid stays finite and removable
+    log_magnitude = 0.5 * np.log(np.maximum(distance2, 1e-300))
+
+    outside = radius2[:, 0] > 1
+    phase = np.arctan2(-u_imag, 1 - u_real)
+    phase[outside] = (np.arctan2(-y[outside], -x[outside]) - w
+                      + np.arctan2(u_imag[outside], radius2[outside] - u_real[outside]))
+
+    singular = distance2 < 1e-24
+    delay = (radius2 - u_real) / np.where(singular, 1, distance2)
+    delay[singular] = 0.5
+    return log_magnitude, phase, delay
+
+
+def root_log_magnitude(roots, w):
+    """log|prod(1 - r e^-jw)| over `roots`."""
+    return root_terms(roots, w)[0].sum(axis=0)
+
+
+def root_phase(roots, w):
+    """Unwrapped phase of prod(1 - r e^-jw) over `roots` (see `root_terms`)."""
+    return root_terms(roots, w)[1].sum(axis=0)
+
+
+def root_group_delay(roots, w):
+    """Group delay in samples of prod(1 - r e^-jw) over `roots`; poles are subtracted by the caller."""
+    return root_terms(roots, w)[2].sum(axis=0)
+
+
+class IncrementalResponse:
+    """
+    Frequency response kept in factored form on a fixed grid.
+
+    H(e^jw) is stored as the running sums, over the zeros minus the same
+    over the poles, of three closed-form per-root terms: log|1 - r e^-jw|,
+    its unwrapped phase and its group delay. Each distinct root's terms are
+    computed once and cached, so adding, removing or moving one root costs
+    a single O(n_points) update instead of re-expanding and re-evaluating
+    the whole transfer function, and no derivative of a sampled response is
+    ever taken. A full re-summation runs every `refresh_interval`
+    incremental updates to bound accumulated rounding drift.
+    """
+
+    def __init__(self, n_points=500, refresh_interval=100):
+        # Same grid as freqz(..., worN=n_points): [0, pi) without the endpoint
+        self.w = np.linspace(0, np.pi, n_points, endpoint=False)
+        self.refresh_interval = refresh_interval
+        self.zeros = Counter()
+        self.poles = Counter()
+        self.gain = 1.0
+        self.term_grid = self.w  # Frequencies the cached terms are evaluated at
+        self.term_cache = {}  # root -> (3, n_points): log magnitude, unwrapped phase, group delay
+        self.sums = np.zeros((3, n_points))
+        self.updates_since_refresh = 0
+
+    def root_terms(self, roots):
+        """Stacked terms of each root, computing those of new roots in one vectorized call."""
+        missing = [root for root in dict.fromkeys(roots) if root not in self.term_cache]
+        if missing:
+            terms = np.stack(root_terms(missing, self.term_grid), axis=1)
+            self.term_cache.update(zip(missing, terms))
+        return [self.term_cache[root] for root in roots]
+
+    def _sum_terms(self, roots):
+        return np.sum(self.root_terms(roots), axis=0) if roots else np.zeros((3, len(self.term_grid)))
+
+    def _forget(self, roots):
+        """Drop the cached terms of roots that are no longer part of the response."""
+        for root in roots:
+            if root not in self.zeros and root not in self.poles:
+                self.term_cache.pop(root, None)
+
+    def _prune_and_sum(self):
+        """Drop the cached terms of absent roots and sum those of the current roots."""
+        zeros = list(self.zeros.elements())
+        poles = list(self.poles.elements())
+        self.term_cache = {root: self.term_cache[root] for root in set(zeros + poles) if root in self.term_cache}
+        self.updates_since_refresh = 0
+        return self._sum_terms(zeros) - self._sum_terms(poles)
+
+    def recompute(self):
+        """Re-sum the cached terms of the current roots."""
+        self.sums = self._prune_and_sum()
+
+    def set_roots(self, zeros, poles, gain=1.0):
+        """Replace every root and recompute from scratch."""
+        self.zeros = Counter(complex(z) for z in zeros)
+        self.poles = Counter(complex(p) for p in poles)
+        self.gain = gain
+        self.recompute()
+
+    def _apply(self, roots, sign):
+        """Multiply (sign=+1) or divide (sign=-1) the response by the factors of `roots`."""
+        if not roots:
+            return
+        self.sums += sign * self._sum_terms(roots)
+        self.updates_since_refresh += 1
+
+    def add_zero(self, root):
+        """Multiply in the factor of a new zero."""
+        self.zeros[complex(root)] += 1
+        self._apply([complex(root)], +1)
+        self._maybe_refresh()
+
+    def remove_zero(self, root):
+        """Divide out the factor of an existing zero."""
+        self._take(self.zeros, root)
+        self._apply([complex(root)], -1)
+        self._forget([complex(root)])
+        self._maybe_refresh()
+
+    def add_pole(self, root):
+        """Divide in the factor of a new pole."""
+        self.poles[complex(root)] += 1
+        self._apply([complex(root)], -1)
+        self._maybe_refresh()
+
+    def remove_pole(self, root):
+        """Multiply out the factor of an existing pole."""
+        self._take(self.poles, root)
+        self._apply([complex(root)], +1)
+        self._forget([complex(root)])
+        self._maybe_refresh()
+
+    def move_zero(self, old, new):
+        """Move one zero to a new location."""
+        self.remove_zero(old)
+        self.add_zero(new)
+
+    def move_pole(self, old, new):
+        """Move one pole to a new location."""
+        self.remove_pole(old)
+        self.add_pole(new)
+
+    @staticmethod
+    def _take(counter, root):
+        """Remove one occurrence of `root` from a root multiset."""
+        root = complex(root)
+        if counter[root] <= 0:
+            raise KeyError(f"Root {root} is not part of the response.")
+        counter[root] -= 1
+        if not counter[root]:
+            del counter[root]
+
+    def update_roots(self, zeros, poles, gain=1.0):
+        """
+        Bring the response in line with a new root set.
+
+        Only the roots that differ from the current set are applied, as one
+        update for the added roots and one for the removed ones; large
+        changes fall back to a full re-summation.
+        """
+        new_zeros = Counter(complex(z) for z in zeros)
+        new_poles = Counter(complex(p) for p in poles)
+        added_zeros = list((new_zeros - self.zeros).elements())
+        removed_zeros = list((self.zeros - new_zeros).elements())
+        added_poles = list((new_poles - self.poles).elements())
+        removed_poles = list((self.poles - new_poles).elements())
+
+        changed = len(added_zeros) + len(removed_zeros) + len(added_poles) + len(removed_poles)
+        total = sum(new_zeros.values()) + sum(new_poles.values())
+        if changed == 0 and gain == self.gain:
+            return
+        self.zeros, self.poles, self.gain = new_zeros, new_poles, gain
+        if changed * 2 > total:
+            self.recompute()
+            return
+
+        # Numerator factors multiply, denominator factors divide
+        self._apply(added_zeros + removed_poles, +1)
+        self._apply(removed_zeros + added_poles, -1)
+        self._forget(removed_zeros + removed_poles)
+        self._maybe_refresh()
+
+    def _maybe_refresh(self):
+        """Re-sum from the cached terms once enough incremental updates have accumulated."""
+        if self.updates_since_refresh >= self.refresh_interval:
+            self.recompute()
+
+    def magnitude(self):
+        """|H(e^jw)| on the grid."""
+        return abs(self.gain) * np.exp(self.sums[0])
+
+    def unwrapped_phase(self):
+        """Continuous phase of H(e^jw) in radians, apart from jumps at zeros on the unit circle."""
+        return self.sums[1] + np.angle(self.gain)
+
+    def phase(self):
+        """Phase of H(e^jw) wrapped to [-pi, pi), as np.angle would report it."""
+        return (self.unwrapped_phase() + np.pi) % (2 * np.pi) - np.pi
+
+    def group_delay(self):
+        """Group delay -d(phase)/dw in samples, from the closed-form per-root terms."""
+        return self.sums[2]
+
+
+# Refinement points around a root near the unit circle, in units of its distance to the circle:
+# evenly spaced angles as seen from the root, which is where its response changes fastest
+REFINE_ANGLES = np.linspace(-np.arctan(16), np.arctan(16), 21)
+REFINE_OFFSETS = np.tan(REFINE_ANGLES)
+REFINE_SPACING = (1 + REFINE_OFFSETS ** 2) * (REFINE_ANGLES[1] - REFINE_ANGLES[0])  # Local gap between offsets
+
+
+class AdaptiveResponse(IncrementalResponse):
+    """
+    Frequency response on a coarse uniform grid refined around sharp features.
+
+    A root at distance d = |1 - |r|| < `refine_distance` from the unit
+    circle produces a notch or resonance about d wide at its angle, so it
+    owns a segment of extra points at angle + d * REFINE_OFFSETS (d is
+    floored at `min_width` for roots on the circle), keeping only those
+    packed more densely than the base grid. Each point stores the
+    running sums of the closed-form per-root terms (see `root_terms`);
+    adding or removing a root updates every point with that root's terms
+    (cached per root on the base grid, as in IncrementalResponse) and
+    creates or drops only that root's segment, whose sums are computed
+    once against the current roots. `w` and `sums` hold the merged grid in
+    increasing frequency after every update. `error_bound` measures the
+    error of the plotted curves against a dense uniform reference.
+    """
+
+    def __init__(self, base_points=96, refine_distance=0.2, min_width=1e-3, refresh_interval=100):
+        super().__init__(n_points=base_points, refresh_interval=refresh_interval)
+        self.base = self.w
+        self.base_step = np.pi / base_points
+        self.refine_distance = refine_distance
+        self.min_width = min_width
+        self.segment_ids = {}  # root -> id of its refinement segment (0 is the base grid)
+        self.next_segment_id = 1
+        self.points = self.base
+        self.point_owner = np.zeros(len(self.base), dtype=int)
+        self.point_sums = np.zeros((3, len(self.base)))
+
+    def refinement(self, root):
+        """Extra frequencies for `root`, or None when it is too far from the unit circle to need any."""
+        distance = abs(1 - abs(root))
+        if distance > self.refine_distance:
+            return None
+        width = max(distance, self.min_width)
+        angles = abs(np.angle(root)) + width * REFINE_OFFSETS
+        # Points spaced wider than the base grid add nothing
+        return angles[(angles >= 0) & (angles < np.pi) & (width * REFINE_SPACING < self.base_step)]
+
+    def _total_terms(self, angles):
+        """Summed terms of every current root (zeros minus poles) at `angles`."""
+        zero_terms = np.sum(root_terms(list(self.zeros.elements()), angles), axis=1)
+        pole_terms = np.sum(root_terms(list(self.poles.elements()), angles), axis=1)
+        return zero_terms - pole_terms
+
+    def _apply(self, roots, sign):
+        """Multiply (sign=+1) or divide (sign=-1) the response at every point by the factors of `roots`."""
+        if not roots:
+            return
+        # The base grid comes first in `points`; only the segment points are evaluated afresh
+        n_base = len(self.base)
+        self.point_sums[:, :n_base] += sign * self._sum_terms(roots)
+        if len(self.points) > n_base:
+            self.point_sums[:, n_base:] += sign * np.sum(root_terms(roots, self.points[n_base:]), axis=1)
+        self.updates_since_refresh += 1
+
+    def _sync_segments(self):
+        """Drop the segments of roots that left, add segments for new roots near the circle and merge."""
+        present = set(self.zeros) | set(self.poles)
+        dropped = [self.segment_ids.pop(root) for root in list(self.segment_ids) if root not in present]
+        if dropped:
+            keep = ~np.isin(self.point_owner, dropped)
+            self.points, self.point_owner, self.point_sums = (
+                self.points[keep], self.point_owner[keep], self.point_sums[:, keep])
+
+        added = [(root, self.refinement(root)) for root in present if root not in self.segment_ids]
+        added = [(root, angles) for root, angles in added if angles is not None]
+        if added:
+            new_points, new_owners = [], []
+            for root, angles in added:
+                self.segment_ids[root] = self.next_segment_id
+                new_points.append(angles)
+                new_owners.append(np.full(len(angles), self.next_segment_id))
+                self.next_segment_id += 1
+            new_points = np.concatenate(new_points)
+            self.points = np.concatenate([self.points, new_points])
+            self.point_owner = np.concatenate([self.point_owner] + new_owners)
+            self.point_sums = np.concatenate([self.point_sums, self._total_terms(new_points)], axis=1)
+
+        order = np.argsort(self.points, kind="stable")
+        self.w = self.points[order]
+        self.sums = self.point_sums[:, order]
+
+    def recompute(self):
+        """Rebuild every segment and re-sum all terms from the current roots."""
+        self.segment_ids = {}
+        self.points = self.base
+        self.point_owner = np.zeros(len(self.base), dtype=int)
+        self.point_sums = self._prune_and_sum()
+        self._sync_segments()
+
+    def _maybe_refresh(self):
+        self._sync_segments()
+        super()._maybe_refresh()
+
+    def error_bound(self, dense_points=16384):
+        """
+        Largest error of the piecewise-linear curves through the adaptive grid
+        against the response evaluated on `dense_points` uniform frequencies:
+        magnitude relative to its peak, unwrapped phase (rad) and group delay
+        (samples), plus the number of points evaluated.
+        """
+        dense = np.linspace(0, np.pi, dense_points, endpoint=False)
+        reference = self._total_terms(dense)
+        reference_magnitude = abs(self.gain) * np.exp(reference[0])
+        return {
+            "points": len(self.w),
+            "magnitude": float(np.max(np.abs(np.interp(dense, self.w, self.magnitude()) - reference_magnitude))
+                               / max(np.max(reference_magnitude), 1e-300)),
+            "phase": float(np.max(np.abs(np.interp(dense, self.w, self.sums[1]) - reference[1]))),
+            "group_delay": float(np.max(np.abs(np.interp(dense, self.w, self.sums[2]) - reference[2]))),
+        }
@@ -1,30 +1,49 @@
 import numpy as np
-from pyqtgraph import mkPen
-from scipy.signal import lfilter
 
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QWidget
 
+from app.services.realtime_engine import RealTimeEngine
+from app.services.render_scheduler import RenderScheduler
+from app.utils.perf_monitor import perf_monitor
+from app.utils.ring_buffer import RingBuffer
+
 
 class MouseSignalInput(QWidget):
     signal_generated = pyqtSignal(np.ndarray)  # Emitted when a new signal is generated
 
-    def __init__(self, original_plot_widget, filtered_plot_widget, zplane_controller,all_pass_add_radioButton,all_pass_remove_radioButton):
+    def __init__(self, original_plot_widget, filtered_plot_widget, filter_model,all_pass_add_radioButton,all_pass_remove_radioButton, max_length=10000):
         super().__init__()
         self.original_plot_widget = original_plot_widget
         self.filtered_plot_widget = filtered_plot_widget
-        self.zplane_controller = zplane_controller
+        self.filter_model = filter_model
         self.all_pass_add_radioButton = all_pass_add_radioButton
         self.all_pass_remove_radioButton = all_pass_remove_radioButton
-        self.signal = []
-        self.max_length = 10000
+        # Raw and filtered history in preallocated circular buffers
+        self.max_length = max_length
+        self.signal = RingBuffer(self.max_length)
+        self.filtered_signal = RingBuffer(self.max_length)
         self.start_x, self.start_y = None, None
         self.current_filter = None
         self.window_length = 100
 
+        # Samples are filtered in blocks on a worker thread, re-primed whenever the model's coefficients change
+        self.engine = RealTimeEngine(block_size=32, latency_budget_ms=16.0, parent=self)
+        self.engine.block_ready.connect(self.on_block_filtered)
+        self.engine.reprimed.connect(self.on_filter_reprimed)
+        self.engine.overrun.connect(self.on_engine_overrun)
+        self.engine_generation = 0  # Results of older configurations are discarded
+        self.filter_version = None
+
+        # Redraws are coalesced to a fixed frame rate, independent of the mouse rate
+        self.render_scheduler = RenderScheduler(target_fps=60, window_length=self.window_length, parent=self)
+        self.render_scheduler.add_curve(self.original_plot_widget, self.signal.view, "red")
+        self.render_scheduler.add_curve(self.filtered_plot_widget, self.filtered_signal.view, "green")
+
         self.setMouseTracking(True)
-        self.all_pass_add_radioButton.toggled.connect(self.apply_filter)
-        self.all_pass_remove_radioButton.toggled.connect(self.apply_filter)
+        # The two buttons are exclusive, so the add button toggles on every change of either
+        self.all_pass_add_radioButton.toggled.connect(lambda: self.apply_filter())
+        self.engine.start()
 
 
 
@@ -34,6 +53,7 @@ class MouseSignalInput(QWidget):
 
     def mouseMoveEvent(self, event):
         """Capture mouse movement and generate signal."""
+        perf_monitor.begin("mouse_to_plot")  # Ends once the sample has been painted
         if self.start_x is None:
             self.start_x, self.start_y = event.x(), event.y()
 
@@ -42,88 +62,69 @@ class MouseSignalInput(QWidget):
 
         # Generate the signal based on y-movement
         point = dy
-        self.signal.append(point)
-
-        # Keep the signal within the max length
-        if len(self.signal) > self.max_length:
-            self.signal.pop(0)
+        self.signal.append(point)  # The buffer drops the oldest sample once full
 
-        # Define a fixed x-axis window length
-
-        # Determine the x-axis range
-        if len(self.signal) > self.window_length:
-            x_min = len(self.signal) - self.window_length
-            x_max = len(self.signal)
+        # Queue only the new sample; its filtered value arrives through on_block_filtered
+        if self.filter_version != self.filter_model.coefficients_version:
+            self.apply_filter()
         else:
-            x_min = 0
-            x_max = self.window_length
+            self.engine.push(point)
 
-        # Update the x-axis range
-        self.original_plot_widget.setXRange(x_min, x_max, padding=0)
+        # Both plots are repainted on the next frame
+        self.render_scheduler.request_redraw()
 
-        # Plot the original signal
-        self.original_plot_widget.plot(self.signal, clear=True, pen=mkPen("red"))
+        # Emit a read-only view of the signal
+        self.signal_generated.emit(self.signal.view())
 
-        # Filter the signal and plot the result
+    def set_filter(self, filter_name):
+        """Note the library filter just loaded into the model and re-filter the history with it."""
+        self.current_filter = filter_name
         self.apply_filter()
 
-        # Emit the signal as a numpy array
-        self.signal_generated.emit(np.array(self.signal))
-
-    def set_filter(self, filter_name):
-        """Set the current filter by name."""
-        if filter_name in self.zplane_controller.filter_library:
-            self.current_filter = self.zplane_controller.filter_library[filter_name]
+    def get_filter_sos(self):
+        """Get the z-plane filter, including enabled all-pass sections, as second-order sections."""
+        # The model already holds the selected design in zero-pole-gain form; its SOS form is cached
+        return self.filter_model.get_filter_sos()
 
     def apply_filter(self):
-        """Apply the selected filter and plot the filtered signal."""
-        if not self.signal:
+        """
+        Load the current coefficients into the engine, which re-filters the
+        history on its thread. Returns an event set once that is done.
+        """
+        with perf_monitor.stage("mouse.reprime_filter"):
+            self.engine_generation, done = self.engine.reconfigure(self.get_filter_sos(), self.signal.view())
+        self.filter_version = self.filter_model.coefficients_version
+        return done
+
+    def on_block_filtered(self, generation, filtered):
+        if generation != self.engine_generation:
             return
-        # Convert the signal to float type
-        float_signal = np.array(self.signal, dtype=np.float64)
-
-        # Check for current filter
-        if self.zplane_controller.filter_selection != "None":
-
-            b, a = self.zplane_controller.filter_library[self.zplane_controller.filter_selection]()
-            if self.all_pass_add_radioButton.isChecked():
-                # Start with the current filter's zeros and poles
-                combined_zeros = []
-                combined_poles = []
-                # Include selected all-pass filters
-                for filter in self.zplane_controller.selected_all_pass_filters:
-                    combined_zeros.extend(filter['zeros'])
-                    combined_poles.extend(filter['poles'])
-
-                b_ap = np.poly(combined_zeros)  # Numerator coefficients
-                a_ap = np.poly(combined_poles)  # Numerator coefficients
-                # Combine filters
-                b = np.convolve(b, b_ap)
-                a = np.convolve(a, a_ap)
-
-        else:
-            # Default to filter coefficients from ZPlaneController
-            b, a = self.zplane_controller.get_filter_coefficients()
-
+        self.filtered_signal.extend(filtered)
+        self.render_scheduler.request_redraw()
 
-        filtered_signal = lfilter(b, a, float_signal)
-        filtered_signal = np.real(filtered_signal)  # Ensure the signal is real
+    def on_engine_overrun(self, dropped):
+        # The dropped samples are still in the history, so re-filter it to realign the plots
+        self.apply_filter()
 
-        if len(filtered_signal) > self.window_length:
-            x_min = len(filtered_signal) - self.window_length
-            x_max = len(filtered_signal)
-        else:
-            x_min = 0
-            x_max = self.window_length
-        self.filtered_plot_widget.setXRange(x_min, x_max, padding=0)
+    def on_filter_reprimed(self, generation, filtered):
+        # Replaces the filtered history, so the state carried forward matches the new coefficients
+        if generation != self.engine_generation:
+            return
+        self.filtered_signal.clear()
+        self.filtered_signal.extend(filtered)
+        self.render_scheduler.request_redraw()
 
-        # Plot the filtered signal
-        self.filtered_plot_widget.plot(filtered_signal, clear=True, pen=mkPen("green"))
+    def set_max_length(self, max_length):
+        """Change how many samples of history are kept."""
+        self.max_length = max_length
+        self.signal.resize(max_length)
+        self.filtered_signal.resize(max_length)
 
     def reset(self):
         """Reset the signal and clear plots."""
-        self.signal = []
-        self.original_plot_widget.clear()
-        self.filtered_plot_widget.clear()
+        self.signal.clear()
+        self.filtered_signal.clear()
+        self.engine_generation, _ = self.engine.reset()
+        self.render_scheduler.clear()
         self.start_x = None
         self.start_y = None
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.signal import sosfilt
+
+
+class MultiChannelFilter:
+    """
+    Streaming second-order-section filter applied to many channels at once.
+
+    Blocks are 2-D (channels x samples by default; `axis` selects the sample
+    axis). All channels are filtered by one vectorized `sosfilt` call, each
+    with its own carried state. With `n_threads > 1` the channels are split
+    into groups filtered concurrently, since sosfilt releases the GIL.
+    """
+
+    def __init__(self, sos, n_channels, axis=-1, n_threads=1):
+        self.sos = np.atleast_2d(np.asarray(sos))
+        self.n_channels = n_channels
+        self.axis = axis
+        self.n_threads = max(1, int(n_threads))
+        self.executor = ThreadPoolExecutor(max_workers=self.n_threads) if self.n_threads > 1 else None
+        self.reset()
+
+    def reset(self):
+        """Zero the state of every channel."""
+        dtype = np.result_type(self.sos, np.float64)
+        self.zi = np.zeros((self.sos.shape[0], self.n_channels, 2), dtype=dtype)
+
+    def _filter_group(self, block, group):
+        filtered, self.zi[:, group] = sosfilt(self.sos, block[group], axis=-1, zi=self.zi[:, group])
+        return filtered
+
+    def process(self, block):
+        """Filter the next block of samples for every channel, carrying the state over."""
+        block = np.moveaxis(np.asarray(block, dtype=np.float64), self.axis, -1)
+        if block.ndim != 2 or block.shape[0] != self.n_channels:
+            raise ValueError(f"Expected {self.n_channels} channels, got block of shape {block.shape}")
+
+        if self.executor is None or self.n_channels < 2:
+            filtered, self.zi = sosfilt(self.sos, block, axis=-1, zi=self.zi)
+        else:
+            # Contiguous channel groups, one per thread; each writes its own slice of the state
+            groups = [slice(g[0], g[-1] + 1) for g in np.array_split(np.arange(self.n_channels), self.n_threads) if len(g)]
+            filtered = np.concatenate(list(self.executor.map(lambda g: self._filter_group(block, g), groups)))
+
+        return np.moveaxis(np.real(filtered), -1, self.axis)
+
+    def close(self):
+        """Shut down the worker threads."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+def filter_channels(sos, signals, axis=-1, n_threads=1):
+    """Filter a whole (channels x samples) array from rest in one call."""
+    signals = np.asarray(signals)
+    channel_axis = 0 if np.ndim(signals) == 2 and axis in (-1, 1) else 1
+    engine = MultiChannelFilter(sos, signals.shape[channel_axis], axis=axis, n_threads=n_threads)
+    try:
+        return engine.process(signals)
+    finally:
+        engine.close()
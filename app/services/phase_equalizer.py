@@ -0,0 +1,126 @@
+"""
+Design all-pass sections that flatten the group delay of a filter over a band.
+
+Each section is a conjugate pole pair r e^{±jθ} with its zeros mirrored
+outside the unit circle at 1 / conj(p), whose group delay has the closed form
+
+    (1 - r²) / (1 - 2 r cos(w ∓ θ) + r²)
+
+summed over both poles. The variance of the combined group delay over the
+band is minimized with Levenberg-Marquardt steps that use the analytic
+Jacobian, and every candidate starting point is updated at once as a batch
+of small linear solves. The radius is kept within (R_MIN, r_max) through a
+logistic parametrization, so every section stays stable and its mirrored
+zeros stay finite. Qt-free.
+"""
+import numpy as np
+
+from app.services.all_pass_sweep import passband_mask
+from app.services.frequency_response import root_group_delay
+
+R_MIN = 0.05
+
+
+def section_radius(rho, r_max):
+    """Pole radius R_MIN + (r_max - R_MIN) / (1 + e^-rho), written without overflow."""
+    return R_MIN + (r_max - R_MIN) * 0.5 * (1 + np.tanh(rho / 2))
+
+
+def section_delay(rho, theta, w, r_max):
+    """
+    Group delay of conjugate all-pass pairs and its derivatives.
+
+    `rho` and `theta` have shape (starts, sections); see `section_radius`
+    for the radius. Returns the delay summed over sections,
+    (starts, len(w)), and the derivatives with respect to rho and theta,
+    each (starts, sections, len(w)).
+    """
+    r = section_radius(rho, r_max)
+    dr_drho = ((r - R_MIN) * (r_max - r) / (r_max - R_MIN))[..., None]
+    r = r[..., None]
+    delay = 0.0
+    d_r = 0.0
+    d_theta = 0.0
+    for sign in (-1, 1):  # Poles at angle +theta and -theta
+        x = w - sign * theta[..., None]
+        cos_x = np.cos(x)
+        denominator = 1 - 2 * r * cos_x + r ** 2
+        delay = delay + (1 - r ** 2) / denominator
+        d_r = d_r + (-2 * r * denominator - (1 - r ** 2) * (2 * r - 2 * cos_x)) / denominator ** 2
+        d_theta = d_theta + sign * 2 * r * (1 - r ** 2) * np.sin(x) / denominator ** 2
+    return delay.sum(axis=1), d_r * dr_drho, d_theta
+
+
+def _residuals(params, base_delay, w, r_max):
+    """Group delay deviation from its band mean and the matching Jacobian, per start."""
+    n_sections = params.shape[1] // 2
+    delay, d_rho, d_theta = section_delay(params[:, :n_sections], params[:, n_sections:], w, r_max)
+    total = base_delay + delay
+    residual = total - total.mean(axis=1, keepdims=True)
+    jacobian = np.concatenate([d_rho, d_theta], axis=1)
+    jacobian = jacobian - jacobian.mean(axis=2, keepdims=True)
+    return residual, jacobian.transpose(0, 2, 1)  # (starts, points), (starts, points, parameters)
+
+
+def sections_from_params(rho, theta, r_max):
+    """All-pass library entries ({'zeros': ..., 'poles': ...}) for one set of parameters."""
+    sections = []
+    for pole in section_radius(rho, r_max) * np.exp(1j * theta):
+        poles = [complex(pole), complex(np.conj(pole))]
+        sections.append({'zeros': [1 / np.conj(p) for p in poles], 'poles': poles})
+    return sections
+
+
+def equalize_group_delay(zeros, poles, n_sections=4, band=None, n_points=256, n_starts=32, iterations=60,
+                         r_max=0.95, seed=0):
+    """
+    Place `n_sections` all-pass pole pairs so the group delay of the filter
+    plus the sections is as flat as possible over `band`.
+
+    `band` is (low, high) in radians per sample; by default the passband of
+    the filter (within 3 dB of its peak) is used. Returns a dict with the
+    "sections" (in the all-pass library format), the "band" grid, and the
+    standard deviation of the group delay over the band "before" and "after".
+    """
+    w = np.linspace(0, np.pi, n_points, endpoint=False)
+    if band is None:
+        w = w[passband_mask(zeros, poles, w)]
+    else:
+        w = np.linspace(band[0], band[1], n_points)
+    base_delay = root_group_delay(zeros, w) - root_group_delay(poles, w)
+
+    # Starting points: radii spread over (0.3, 0.9) of the allowed range, angles spread over the band
+    rng = np.random.default_rng(seed)
+    fraction = rng.uniform(0.3, 0.9, (n_starts, n_sections))
+    rho = np.log(fraction / (1 - fraction))
+    theta = np.sort(rng.uniform(w[0], w[-1], (n_starts, n_sections)), axis=1)
+    params = np.concatenate([rho, theta], axis=1)
+
+    residual, jacobian = _residuals(params, base_delay, w, r_max)
+    cost = np.mean(residual ** 2, axis=1)
+    damping = np.full(n_starts, 1e-2)
+    identity = np.eye(params.shape[1])
+    for _ in range(iterations):
+        # Damped Gauss-Newton step for every start, as one batch of small solves
+        normal = jacobian.transpose(0, 2, 1) @ jacobian
+        gradient = np.einsum("spk,sp->sk", jacobian, residual)
+        scale = np.einsum("skk->sk", normal)[:, None, :] * identity + 1e-9 * identity
+        step = np.linalg.solve(normal + damping[:, None, None] * scale, -gradient[..., None])[..., 0]
+
+        trial = params + step
+        trial_residual, trial_jacobian = _residuals(trial, base_delay, w, r_max)
+        trial_cost = np.mean(trial_residual ** 2, axis=1)
+        better = trial_cost < cost
+        params[better] = trial[better]
+        residual[better] = trial_residual[better]
+        jacobian[better] = trial_jacobian[better]
+        cost[better] = trial_cost[better]
+        damping = np.where(better, damping / 3, damping * 3).clip(1e-9, 1e9)
+
+    best = np.argmin(cost)
+    return {
+        "sections": sections_from_params(params[best, :n_sections], params[best, n_sections:], r_max),
+        "band": w,
+        "before": float(base_delay.std()),
+        "after": float(np.sqrt(cost[best])),
+    }
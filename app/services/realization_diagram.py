@@ -0,0 +1,163 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from PyQt5.QtCore import QObject, QRectF, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtSvg import QSvgRenderer
+
+
+def normalize_coefficients(b, a):
+    """Scale (b, a) so that a[0] == 1."""
+    b, a = np.atleast_1d(b), np.atleast_1d(a)
+    if a[0] != 1:
+        b = b / a[0]
+        a = a / a[0]
+    return b, a
+
+
+def coefficients_key(b, a, decimals=12):
+    """Hashable key of normalized coefficients, equal for designs that draw the same diagram."""
+    b, a = normalize_coefficients(b, a)
+    return tuple(np.round(b, decimals).tolist()), tuple(np.round(a, decimals).tolist())
+
+
+def draw_direct_form_ii(b_coeffs, a_coeffs):
+    """Draw the Direct Form II realization of (b, a) with SchemDraw and return it as SVG bytes."""
+    # SchemDraw pulls in matplotlib, so it is only imported once a diagram is requested
+    import schemdraw
+    import schemdraw.elements as elm
+
+    b_coeffs, a_coeffs = normalize_coefficients(b_coeffs, a_coeffs)
+
+    # The SVG backend lays out and serializes in pure Python, so it is safe off the GUI thread
+    d = schemdraw.Drawing(canvas="svg", show=False)
+    d.config(unit=2)  # Set unit scale for spacing
+
+    # Input signal
+    d.add(elm.SourceV().label("x[n]", loc='left'))  # x_in
+
+    # First Summation Node (Input to Feedforward and Feedback Paths)
+    sum_node1 = d.add(elm.Dot(open=True).label("Σ", loc='center'))
+
+    # Feedforward Path (b-coefficients)
+    for i, b in enumerate(b_coeffs):
+        d.add(elm.Line(w=1, h=1).label(f"b{i}={b:.2f}", loc='center'))
+        if i == 0:
+            d.add(elm.Dot(open=True).label("y[n]", loc='center'))  # output
+
+    # Feedback Path (a-coefficients)
+    for i, a in enumerate(a_coeffs[1:], start=1):  # Skip a[0] (assumed 1)
+        d.add(elm.Line().down().length(1.5))
+        d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
+        d.add(elm.Line().left().length(1.5))
+        d.add(elm.Line(w=2, h=1).label(f"a{i}={a:.2f}", loc='center'))
+
+    # Shared Delay Line (Z⁻¹ blocks)
+    shared_delay_start = sum_node1
+    for _ in range(max(len(a_coeffs), len(b_coeffs)) - 1):
+        d.add(elm.Line().down().length(2))
+        d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
+        d.add(elm.Line().down().length(2).at(shared_delay_start.end))
+
+    # Solid lines are written with an empty dash pattern, which Qt's SVG renderer draws as no line at all
+    return d.get_imagedata("svg").replace(b"stroke-dasharray:-;", b"")
+
+
+def rasterize_svg(svg, size):
+    """Render SVG bytes into a transparent QImage of `size`, keeping the aspect ratio."""
+    renderer = QSvgRenderer(svg)
+    image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    fitted = renderer.defaultSize().scaled(size, Qt.KeepAspectRatio)
+    x = (size.width() - fitted.width()) / 2
+    y = (size.height() - fitted.height()) / 2
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    renderer.render(painter, QRectF(x, y, fitted.width(), fitted.height()))
+    painter.end()
+    return image
+
+
+class DiagramRenderer(QObject):
+    """
+    Draw realization diagrams on a worker thread, caching them by coefficients.
+
+    `request` returns immediately; the image is delivered through
+    `diagram_ready` on the GUI thread. Requests made while a diagram is
+    being drawn replace each other, so only the newest one is drawn next.
+    """
+
+    diagram_ready = pyqtSignal(QImage)
+    _rendered = pyqtSignal(object, QImage)
+
+    def __init__(self, max_size=32, parent=None):
+        super().__init__(parent)
+        self.max_size = max_size
+        self.cache = OrderedDict()  # (coefficients key, width, height) -> QImage
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diagram-renderer")
+        self.busy = False
+        self.queued = None
+        self.latest_key = None
+        self.hits = 0
+        self.misses = 0
+        self._rendered.connect(self._on_rendered)
+
+    def request(self, b, a, size):
+        """Ask for the diagram of (b, a) at `size`; returns True when it was served from the cache."""
+        size = QSize(size)
+        key = (coefficients_key(b, a), size.width(), size.height())
+        self.latest_key = key
+        if key in self.cache:
+            self.queued = None
+            self.hits += 1
+            self.cache.move_to_end(key)
+            self.diagram_ready.emit(self.cache[key])
+            return True
+
+        self.misses += 1
+        if self.busy:
+            self.queued = (key, b, a, size)
+        else:
+            self._submit(key, b, a, size)
+        return False
+
+    def _submit(self, key, b, a, size):
+        self.busy = True
+        self.executor.submit(self._render, key, b, a, size)
+
+    def _render(self, key, b, a, size):
+        # Runs on the worker thread; the signal is queued back to the GUI thread
+        try:
+            image = rasterize_svg(draw_direct_form_ii(b, a), size)
+        except Exception as error:
+            print(f"Error drawing the realization diagram: {error}")
+            image = QImage()
+        self._rendered.emit(key, image)
+
+    def _on_rendered(self, key, image):
+        self.busy = False
+        if not image.isNull():
+            self.cache[key] = image
+            if len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+            if key == self.latest_key:
+                self.diagram_ready.emit(image)
+
+        if self.queued is not None:
+            queued, self.queued = self.queued, None
+            if queued[0] in self.cache:
+                self.diagram_ready.emit(self.cache[queued[0]])
+            else:
+                self._submit(*queued)
+
+    def clear(self):
+        self.cache.clear()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        """Return cache counters as a dict."""
+        return {"size": len(self.cache), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,217 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from PyQt5.QtCore import QCoreApplication, QObject, pyqtSignal
+
+from app.services.streaming_filter import StreamingFilter
+from app.utils.perf_monitor import perf_monitor
+
+
+class RealTimeEngine(QObject):
+    """
+    Filter incoming samples in blocks on a worker thread.
+
+    `push` only appends to a bounded queue, so the caller never waits on
+    the filter. The worker takes `block_size` samples at a time, or fewer
+    once the oldest queued sample is about to exceed `latency_budget_ms`
+    (counted as an underrun), and posts the output through `block_ready`.
+    When the queue is full the oldest samples are dropped (counted as
+    overruns) and `overrun` is emitted, since the output no longer lines up
+    with the input until the next `reconfigure`.
+
+    `reconfigure` swaps the coefficients and re-runs the given history from
+    rest on the worker, posting the result through `reprimed`; queued
+    samples already contained in that history are skipped. Both signals
+    carry the generation of the configuration that produced them, so
+    results computed before a reconfiguration can be told apart.
+
+    With `threaded=False` every call is processed immediately in the
+    caller's thread, which is useful for scripts and benchmarks.
+    """
+
+    block_ready = pyqtSignal(int, np.ndarray)  # generation, filtered block
+    reprimed = pyqtSignal(int, np.ndarray)  # generation, filtered history
+    overrun = pyqtSignal(int)  # number of samples dropped unfiltered
+
+    def __init__(self, block_size=32, latency_budget_ms=16.0, capacity=8192, threaded=True, parent=None):
+        super().__init__(parent)
+        self.block_size = block_size
+        self.latency_budget = latency_budget_ms / 1e3
+        self.capacity = capacity
+        self.threaded = threaded
+        self.filter = StreamingFilter()
+
+        self.condition = threading.Condition()
+        self.pending = deque()  # Queued samples
+        self.arrivals = deque()  # perf_counter() time each queued sample arrived
+        self.commands = deque()  # (generation, sos, history, pushed count, done event)
+        self.sos = None  # Coefficients of the latest reconfigure; the worker may still be loading them
+        self.pushed = 0  # Samples accepted by push()
+        self.consumed = 0  # Samples taken off the queue, filtered, skipped or dropped
+        self.generation = 0
+        self.running = False
+        self.thread = None
+
+        # Statistics
+        self.blocks = 0
+        self.underruns = 0
+        self.overruns = 0
+        self.late_blocks = 0
+        self.max_occupancy = 0
+        self.max_latency = 0.0
+        self.processing_time = 0.0  # Moving average of the time to filter one block
+
+    def start(self):
+        """Start the worker thread; it is stopped when the application quits."""
+        if not self.threaded or self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="realtime-engine", daemon=True)
+        self.thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def push(self, samples):
+        """Queue new input samples for filtering."""
+        samples = np.atleast_1d(np.asarray(samples, dtype=np.float64))
+        if not self.threaded:
+            self.pushed += len(samples)
+            self.consumed += len(samples)
+            self._filter_block(self.generation, samples, time.perf_counter(), partial=False)
+            return
+
+        now = time.perf_counter()
+        with self.condition:
+            self.pushed += len(samples)
+            overflow = max(0, len(self.pending) + len(samples) - self.capacity)
+            if overflow > 0:
+                # Drop the oldest samples rather than block the caller
+                for _ in range(min(overflow, len(self.pending))):
+                    self.pending.popleft()
+                    self.arrivals.popleft()
+                self.consumed += overflow
+                self.overruns += overflow
+                samples = samples[-self.capacity:]
+            self.pending.extend(samples.tolist())
+            self.arrivals.extend([now] * len(samples))
+            self.max_occupancy = max(self.max_occupancy, len(self.pending))
+            self.condition.notify()
+        if overflow:
+            self.overrun.emit(overflow)
+
+    def reconfigure(self, sos, history=()):
+        """
+        Load new coefficients and re-filter `history` (every sample pushed so
+        far that should appear in the output) from rest. Returns the new
+        generation and an event that is set once the history has been filtered.
+        """
+        history = np.array(history, dtype=np.float64)  # Copied: the caller's buffer keeps changing
+        done = threading.Event()
+        with self.condition:
+            self.generation += 1
+            self.sos = sos
+            command = (self.generation, sos, history, self.pushed, done)
+            if self.threaded:
+                self.commands.append(command)
+                self.condition.notify()
+        if not self.threaded:
+            self._run_command(command)
+        return command[0], done
+
+    def reset(self):
+        """Clear the filter state and drop every queued sample."""
+        with self.condition:
+            sos = self.sos
+        return self.reconfigure(sos if sos is not None else [[1, 0, 0, 1, 0, 0]])
+
+    def get_stats(self):
+        """Return queue and timing counters as a dict."""
+        with self.condition:
+            occupancy = len(self.pending)
+        return {
+            "occupancy": occupancy,
+            "capacity": self.capacity,
+            "max_occupancy": self.max_occupancy,
+            "blocks": self.blocks,
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "late_blocks": self.late_blocks,
+            "max_latency_ms": self.max_latency * 1e3,
+            "block_processing_ms": self.processing_time * 1e3,
+        }
+
+    def _run(self):
+        while True:
+            with self.condition:
+                command, block = self._next_work()
+                if command is None and block is None:
+                    return
+            if command is not None:
+                self._run_command(command)
+            else:
+                self._filter_block(*block)
+
+    def _next_work(self):
+        """Wait (holding the condition) for a command or a block; (None, None) once stopped."""
+        while self.running:
+            if self.commands:
+                command = self.commands.popleft()
+                # Queued samples up to the command are already part of its history
+                skip = max(0, command[3] - self.consumed)  # Already consumed after an overrun
+                for _ in range(skip):
+                    self.pending.popleft()
+                    self.arrivals.popleft()
+                self.consumed += skip
+                return command, None
+
+            if self.pending:
+                # Leave enough of the budget for filtering the block
+                deadline = self.arrivals[0] + max(0.0, self.latency_budget - 2 * self.processing_time)
+                remaining = deadline - time.perf_counter()
+                if len(self.pending) >= self.block_size or remaining <= 0:
+                    count = min(self.block_size, len(self.pending))
+                    samples = np.array([self.pending.popleft() for _ in range(count)])
+                    first_arrival = self.arrivals[0]
+                    for _ in range(count):
+                        self.arrivals.popleft()
+                    self.consumed += count
+                    return None, (self.generation, samples, first_arrival, count < self.block_size)
+                self.condition.wait(remaining)
+            else:
+                self.condition.wait()
+        return None, None
+
+    def _run_command(self, command):
+        generation, sos, history, _, done = command
+        with perf_monitor.stage("engine.reprime"):
+            self.filter.set_sos(sos)
+            filtered = self.filter.prime(history) if len(history) else np.zeros(0)
+        self.reprimed.emit(generation, filtered)
+        done.set()
+
+    def _filter_block(self, generation, samples, first_arrival, partial):
+        start = time.perf_counter()
+        filtered = self.filter.process(samples)
+        finished = time.perf_counter()
+        self.block_ready.emit(generation, filtered)
+
+        self.blocks += 1
+        self.underruns += partial
+        self.processing_time += 0.1 * ((finished - start) - self.processing_time)
+        latency = finished - first_arrival
+        self.max_latency = max(self.max_latency, latency)
+        self.late_blocks += latency > self.latency_budget
+        if perf_monitor.enabled:
+            perf_monitor.record("engine.block", finished - start)
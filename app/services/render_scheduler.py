@@ -0,0 +1,101 @@
+import time
+
+from pyqtgraph import mkPen
+
+from PyQt5.QtCore import QObject, QTimer
+
+from app.utils.perf_monitor import perf_monitor
+
+
+class RenderScheduler(QObject):
+    """
+    Coalesce plot updates to a target frame rate.
+
+    Samples are ingested at whatever rate the input produces them; each
+    request only marks the plots dirty, and a single-shot QTimer repaints
+    them at most `target_fps` times per second by pushing the latest data
+    into persistent PlotDataItems with `setData`.
+    """
+
+    def __init__(self, target_fps=60, window_length=100, parent=None):
+        super().__init__(parent)
+        self.window_length = window_length
+        self.curves = []  # (plot_widget, curve, data_source)
+        self.dirty = False
+        self.last_render_time = 0.0
+
+        # Frame statistics
+        self.frames_requested = 0
+        self.frames_rendered = 0
+        self.frames_merged = 0
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.render)
+        self.set_target_fps(target_fps)
+
+    def set_target_fps(self, target_fps):
+        """Change the maximum redraw rate."""
+        self.target_fps = target_fps
+        self.frame_interval = 1.0 / target_fps
+
+    def add_curve(self, plot_widget, data_source, pen):
+        """Create a persistent curve on `plot_widget` fed by `data_source()` at each frame."""
+        curve = plot_widget.plot(pen=mkPen(pen), clipToView=True)
+        self.curves.append((plot_widget, curve, data_source))
+        return curve
+
+    def request_redraw(self):
+        """Mark the plots dirty; requests arriving before the next frame are merged."""
+        self.frames_requested += 1
+        if self.dirty:
+            self.frames_merged += 1
+            return
+        self.dirty = True
+
+        # Wait out the rest of the current frame interval
+        elapsed = time.perf_counter() - self.last_render_time
+        delay_ms = max(0.0, self.frame_interval - elapsed) * 1000
+        self.timer.start(int(delay_ms))
+
+    def render(self):
+        """Push the latest data of every curve to the screen."""
+        self.dirty = False
+        self.last_render_time = time.perf_counter()
+        self.frames_rendered += 1
+
+        for plot_widget, curve, data_source in self.curves:
+            data = data_source()
+            with perf_monitor.stage("render.set_data"):
+                curve.setData(data)
+
+            # Keep a fixed-length window on the newest samples
+            if len(data) > self.window_length:
+                x_min = len(data) - self.window_length
+                x_max = len(data)
+            else:
+                x_min = 0
+                x_max = self.window_length
+            plot_widget.setXRange(x_min, x_max, padding=0)
+
+            if perf_monitor.enabled:
+                # Paint now rather than at the next event-loop pass so painting can be timed
+                with perf_monitor.stage("render.paint"):
+                    plot_widget.viewport().repaint()
+        perf_monitor.end("mouse_to_plot")
+
+    def clear(self):
+        """Empty every curve and drop any pending frame."""
+        self.timer.stop()
+        self.dirty = False
+        for _, curve, _ in self.curves:
+            curve.setData([])
+
+    def get_stats(self):
+        """Return frame counters as a dict."""
+        return {
+            "target_fps": self.target_fps,
+            "frames_requested": self.frames_requested,
+            "frames_rendered": self.frames_rendered,
+            "frames_merged": self.frames_merged,
+        }
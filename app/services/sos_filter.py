@@ -0,0 +1,112 @@
+import numpy as np
+
+
+def _lexsorted(roots):
+    """Sort complex roots by real part, then imaginary part."""
+    return roots[np.lexsort((roots.imag, roots.real))]
+
+
+def pair_conjugates(roots, tol=1e-8):
+    """
+    Split roots into conjugate pairs, real roots and unpaired complex roots.
+
+    Returns ``(pairs, real_roots, unpaired)`` where `pairs` holds the upper
+    half-plane member of each conjugate pair.
+    """
+    roots = np.atleast_1d(np.asarray(roots, dtype=complex))
+    is_real = np.abs(roots.imag) <= tol * np.maximum(1.0, np.abs(roots))
+    real_roots = roots[is_real].real
+
+    upper = _lexsorted(roots[~is_real & (roots.imag > 0)])
+    lower = _lexsorted(np.conj(roots[~is_real & (roots.imag < 0)]))
+
+    # Merge-walk both sorted lists, matching roots that are conjugates of each other
+    pairs, unpaired = [], []
+    i = j = 0
+    while i < len(upper) and j < len(lower):
+        u, l = upper[i], lower[j]
+        if abs(u - l) <= tol * max(1.0, abs(u)):
+            pairs.append(u)
+            i += 1
+            j += 1
+        elif (u.real, u.imag) < (l.real, l.imag):
+            unpaired.append(u)
+            i += 1
+        else:
+            unpaired.append(np.conj(l))
+            j += 1
+    unpaired.extend(upper[i:])
+    unpaired.extend(np.conj(lower[j:]))
+
+    return np.array(pairs, dtype=complex), real_roots, np.array(unpaired, dtype=complex)
+
+
+def _quadratics(roots, tol=1e-8):
+    """
+    Group roots into second-order polynomials in z^-1, conjugate pairs first.
+
+    Returns ``(coeffs, anchors)``: an (n, 3) coefficient array and one
+    representative root per row, used to pair numerator and denominator rows.
+    """
+    pairs, real_roots, unpaired = pair_conjugates(roots, tol)
+    rows, anchors = [], []
+
+    # Conjugate pairs give real sections: 1 - 2 Re(r) z^-1 + |r|^2 z^-2
+    for r in pairs:
+        rows.append([1.0, -2.0 * r.real, abs(r) ** 2])
+        anchors.append(r)
+
+    # Remaining roots two at a time (real with real, leftovers complex with complex)
+    for group in (real_roots.astype(complex), unpaired):
+        for start in range(0, len(group), 2):
+            chunk = group[start:start + 2]
+            rows.append(np.concatenate([np.poly(chunk), np.zeros(3 - len(chunk) - 1)]))
+            anchors.append(chunk[np.argmax(np.abs(chunk))])
+
+    if not rows:
+        return np.zeros((0, 3)), np.zeros(0, dtype=complex)
+    coeffs = np.array(rows)
+    if not np.iscomplexobj(coeffs) or np.all(coeffs.imag == 0):
+        coeffs = coeffs.real
+    return coeffs, np.array(anchors, dtype=complex)
+
+
+def roots_to_sos(zeros, poles, gain=1.0, tol=1e-8):
+    """
+    Build a second-order-section cascade from zeros, poles and gain.
+
+    Conjugate pairs are grouped into real sections automatically; any
+    leftover complex roots become complex-valued sections. Each pole section
+    is matched with the nearest remaining zero section, and sections are
+    ordered with the poles closest to the unit circle last.
+    """
+    zero_rows, zero_anchors = _quadratics(zeros, tol)
+    pole_rows, pole_anchors = _quadratics(poles, tol)
+    n_sections = max(len(zero_rows), len(pole_rows), 1)
+
+    dtype = np.result_type(zero_rows, pole_rows, np.asarray(gain), np.float64)
+    sos = np.zeros((n_sections, 6), dtype=dtype)
+    sos[:, 0] = 1.0
+    sos[:, 3] = 1.0
+
+    # Poles nearest the unit circle go last so their gain peaks are applied at the end
+    pole_order = np.argsort(np.abs(np.abs(pole_anchors) - 1.0))[::-1]
+    sos[:len(pole_rows), 3:] = pole_rows[pole_order]
+
+    # Give each pole section the closest unused zero section
+    free = np.ones(len(zero_rows), dtype=bool)
+    for section, pole_index in enumerate(pole_order):
+        if not free.any():
+            break
+        distance = np.abs(zero_anchors - pole_anchors[pole_index])
+        distance[~free] = np.inf
+        choice = np.argmin(distance)
+        sos[section, :3] = zero_rows[choice]
+        free[choice] = False
+
+    # Zero sections beyond the number of pole sections fill the remaining rows
+    leftover = zero_rows[free]
+    sos[len(pole_rows):len(pole_rows) + len(leftover), :3] = leftover
+
+    sos[0, :3] = sos[0, :3] * gain
+    return sos
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class StreamingFilter:
+    """
+    IIR filter that keeps its delay-line state between calls.
+
+    Coefficients are either a transfer function (`set_coefficients`) or a
+    cascade of second-order sections (`set_sos`), in which case each section
+    carries its own two-element state.
+    """
+
+    def __init__(self, b=(1.0,), a=(1.0,)):
+        self.b = None
+        self.a = None
+        self.sos = None
+        self.zi = None
+        self.set_coefficients(b, a)
+
+    def set_coefficients(self, b, a):
+        """Load transfer-function coefficients and clear the internal state."""
+        self.b = np.atleast_1d(np.asarray(b))
+        self.a = np.atleast_1d(np.asarray(a))
+        self.sos = None
+        self.reset()
+
+    def set_sos(self, sos):
+        """Load a second-order-section cascade and clear the internal state."""
+        self.sos = np.atleast_2d(np.asarray(sos))
+        self.b = self.a = None
+        self.reset()
+
+    def reset(self):
+        """Zero the internal state."""
+        if self.sos is not None:
+            dtype = np.result_type(self.sos, np.float64)
+            self.zi = np.zeros((self.sos.shape[0], 2), dtype=dtype)
+        else:
+            order = max(len(self.a), len(self.b)) - 1
+            dtype = np.result_type(self.b, self.a, np.float64)
+            self.zi = np.zeros(order, dtype=dtype)
+
+    def prime(self, history):
+        """Run the whole history from rest and keep the final state, returning the output."""
+        self.reset()
+        return self.process(history)
+
+    def process(self, samples):
+        """Filter only the new samples, carrying the state over from the previous call."""
+        from scipy.signal import lfilter, sosfilt  # Deferred to the first call to keep scipy off the startup path
+
+        samples = np.asarray(samples, dtype=np.float64)
+        if samples.size == 0:
+            return np.zeros(0)
+
+        if self.sos is not None:
+            filtered, self.zi = sosfilt(self.sos, samples, zi=self.zi)
+        elif self.zi.size == 0:
+            # Zeroth-order filter: a plain gain, nothing to carry
+            filtered = samples * (self.b[0] / self.a[0])
+        else:
+            filtered, self.zi = lfilter(self.b, self.a, samples, zi=self.zi)
+        return np.real(filtered)  # Ensure the signal is real
@@ -1,24 +1,36 @@
-import csv
 import os
-from tkinter import Tk
-from tkinter.filedialog import askopenfilename, asksaveasfilename
 
 import numpy as np
-from pyqtgraph import mkPen
-from pyqtgraph.examples.glow import update_plot
-from scipy.signal import butter, cheby1, cheby2, ellip, freqz
-import schemdraw
-import schemdraw.elements as elm
-import schemdraw.flow as flow  # Use the flow module for box elements
-
-from PyQt5.QtCore import Qt
+from pyqtgraph import ViewBox, mkPen
+
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QLabel, QVBoxLayout
 from PyQt5 import QtWidgets
 
+from app.model.filter_model import FilterModel
+from app.services.realization_diagram import DiagramRenderer, draw_direct_form_ii
+from app.utils.perf_monitor import perf_monitor
+
+
+# Views of the phase plot: FilterModel.frequency_response view and y-axis label
+PHASE_VIEWS = {
+    "Phase": ("phase", "Phase (rad)"),
+    "Unwrapped phase": ("unwrapped_phase", "Phase (rad)"),
+    "Group delay": ("group_delay", "Group delay (samples)"),
+}
+
 
 class ZPlaneController:
-    def __init__(self, plot_widget, mag_plot_widget, phase_plot_widget, realization_plot, add_conjugate_checkbox, zeros_radio_button, poles_radio_button,custom_aribatry_input,all_pass_remove_radioButton,all_pass_add_radioButton,select_all_pass_filters_button,create_button):
+    """
+    Z-plane, magnitude and phase plots over a FilterModel.
+
+    Mouse and widget events are forwarded to `model` as edits, and
+    `update_plot` redraws the roots and responses from it; the all-pass
+    radio buttons mirror `model.all_pass_enabled`.
+    """
+
+    def __init__(self, plot_widget, mag_plot_widget, phase_plot_widget, realization_plot, add_conjugate_checkbox, zeros_radio_button, poles_radio_button,custom_aribatry_input,all_pass_remove_radioButton,all_pass_add_radioButton,select_all_pass_filters_button,create_button, model=None):
+        self.model = model if model is not None else FilterModel()
         self.plot_widget = plot_widget
         self.add_conjugate_checkbox = add_conjugate_checkbox
         self.zeros_radio_button = zeros_radio_button
@@ -32,12 +44,6 @@ class ZPlaneController:
         self.select_all_pass_filters_button =select_all_pass_filters_button
         self.create_button = create_button
 
-        # Data storage
-        self.zeros = []
-        self.poles = []
-        self.history = []
-        self.redo_stack = []
-
         # Plot configuration
         self.unit_circle = self.plot_widget.plot(pen=mkPen("blue", width=3))
         self.scatter_zeros = self.plot_widget.plot(pen=None, symbol='o', symbolBrush='green', symbolSize=12)
@@ -51,53 +57,36 @@ class ZPlaneController:
         # Frequency response plots
         self.mag_response = self.mag_plot_widget.plot(pen=mkPen("green"))
         self.phase_response = self.phase_plot_widget.plot(pen=mkPen("red"))
+        self.phase_view = "Phase"
 
         # Signal connections
         self.plot_widget.scene().sigMouseClicked.connect(self.on_mouse_click)
 
-        # Filter library
-        self.filter_library = {
-            # None Option
-            "None": lambda: (np.array([1.0]), np.array([1.0])),  # No filtering applied
-
-            # Butterworth Filters
-            "Butterworth LPF": lambda: butter(4, 0.4, btype="low", output="ba"),
-            "Butterworth HPF": lambda: butter(4, 0.4, btype="high", output="ba"),
-            "Butterworth BPF": lambda: butter(4, [0.3, 0.6], btype="band", output="ba"),
-
-            # Chebyshev I Filter
-            "Chebyshev I LPF": lambda: cheby1(4, 1, 0.4, btype="low", output="ba"),
-            "Chebyshev I HPF": lambda: cheby1(4, 1, 0.4, btype="high", output="ba"),
-            "Chebyshev I BPF": lambda: cheby1(4, 1, [0.3, 0.6], btype="band", output="ba"),
-
-            # Chebyshev II Filters
-            "Chebyshev II LPF": lambda: cheby2(4, 20, 0.4, btype="low", output="ba"),
-            "Chebyshev II HPF": lambda: cheby2(4, 20, 0.4, btype="high", output="ba"),
-            "Chebyshev II BPF": lambda: cheby2(4, 20, [0.3, 0.6], btype="band", output="ba"),
-
-            # Elliptic Filters
-            "Elliptic LPF": lambda: ellip(4, 1, 20, 0.4, btype="low", output="ba"),
-            "Elliptic HPF": lambda: ellip(4, 1, 20, 0.4, btype="high", output="ba"),
-        }
-
-        # Initial filter selection set to None
-        self.filter_selection = "None"  # Default to no filtering
+        # Dragging: the view box hands left-button drags to us, other drags still pan
+        self.drag_target = None  # (root id, conjugate root id or None)
+        self.drag_hit_radius = 0.08
+        self.drag_timer = QTimer()
+        self.drag_timer.setSingleShot(True)
+        self.drag_timer.setInterval(16)  # At most ~60 response updates per second
+        self.drag_timer.timeout.connect(self.update_plot)
+        self.plot_widget.getViewBox().mouseDragEvent = self.on_mouse_drag
 
-        # All-pass filter library
-        self.all_pass_filter_library = {
-            "All-Pass 1": {'zeros': [-2], 'poles': [-0.5]},
-            "All-Pass 2": {'zeros': [1/0.8], 'poles': [0.8]},
-            "All-Pass 3": {'zeros': [-2-1j], 'poles': [1/(-2+1j)]},
-            "All-Pass 4": {'zeros': [2j], 'poles': [1 / (-2j)]},
-        }
-
-        self.selected_all_pass_filters = []
+        # Design the library in the background once the event loop runs, so the first selection is a cache hit
+        QTimer.singleShot(0, self.model.warm_designs)
 
         self.select_all_pass_filters_button.clicked.connect(self.openFilterPopup)
         self.create_button.clicked.connect(self.add_custom_all_pass_filter)
 
-        self.all_pass_add_radioButton.toggled.connect(self.update_plot)
-        self.all_pass_remove_radioButton.toggled.connect(self.update_plot)
+        # Toggling either radio button toggles the add button too
+        self.all_pass_add_radioButton.toggled.connect(self.on_all_pass_toggled)
+
+        # Realization diagrams are drawn on a worker thread into the one persistent label
+        self.diagram_renderer = DiagramRenderer()
+        self.diagram_renderer.diagram_ready.connect(self.show_diagram)
+
+    def on_all_pass_toggled(self):
+        if self.model.set_all_pass(enabled=self.all_pass_add_radioButton.isChecked()):
+            self.update_plot()
 
     def openFilterPopup(self):
         # Create a new dialog
@@ -109,7 +98,7 @@ class ZPlaneController:
         layout = QtWidgets.QVBoxLayout()
 
         # Sample filter options (you can replace these with your actual filters)
-        filters = self.all_pass_filter_library
+        filters = self.model.all_pass_filter_library
 
         # Create checkboxes for each filter
         self.filter_checkboxes = {}
@@ -127,10 +116,10 @@ class ZPlaneController:
         self.filter_dialog.exec_()
 
     def applyFilters(self):
-        self.selected_all_pass_filters = [self.all_pass_filter_library[filter_name] for filter_name, checkbox in self.filter_checkboxes.items() if
-                            checkbox.isChecked()]
-        print("Selected Filters:", self.selected_all_pass_filters)  # Process the selected filters as needed
-        self.all_pass_add_radioButton.click()
+        selected = [self.model.all_pass_filter_library[filter_name] for filter_name, checkbox in self.filter_checkboxes.items() if
+                    checkbox.isChecked()]
+        print("Selected Filters:", selected)  # Process the selected filters as needed
+        self.model.set_all_pass(selected, True)
         self.update_plot()
         self.filter_dialog.close()
 
@@ -139,30 +128,79 @@ class ZPlaneController:
 
         # Filter out empty strings and convert to complex numbers
         zeros = [complex(float(z.strip())) for z in a if z.strip()]
-        conjugates = np.conjugate(zeros)
-        poles = 1/conjugates
-
-        self.selected_all_pass_filters=[{'zeros': zeros, 'poles': poles}]
-        self.all_pass_add_radioButton.click()
+        section = self.model.add_custom_all_pass(zeros)
         self.update_plot()
-        self.all_pass_filter_library["Custom"] ={'zeros': zeros, 'poles': poles}
         self.custom_aribatry_input.clear()
-        print("Selected Filters:", self.selected_all_pass_filters)
+        print("Selected Filters:", [section])
+
+    def openSweepPopup(self):
+        """Run the all-pass sweep and list the best combinations; returns the one applied, or None."""
+        from app.services.all_pass_sweep import SWEEP_METRICS  # Imported on first use: it pulls in multiprocessing
 
+        self.sweep_dialog = QtWidgets.QDialog()
+        self.sweep_dialog.setWindowTitle("All-Pass Sweep")
+        self.sweep_dialog.setGeometry(100, 100, 560, 420)
+        layout = QtWidgets.QVBoxLayout()
+
+        metric_combobox = QtWidgets.QComboBox()
+        for metric, label in SWEEP_METRICS.items():
+            metric_combobox.addItem(label, metric)
+        run_button = QtWidgets.QPushButton("Run")
+        table = QtWidgets.QTableWidget(0, 3)
+        table.setHorizontalHeaderLabels(["Filter", "All-pass sections", "Score"])
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        table.horizontalHeader().setStretchLastSection(True)
+        apply_button = QtWidgets.QPushButton("Apply")
+        results = []
+
+        def run():
+            QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                results[:] = self.model.sweep_all_pass(metric_combobox.currentData())
+            finally:
+                QtWidgets.QApplication.restoreOverrideCursor()
+            table.setRowCount(len(results))
+            for row, result in enumerate(results):
+                table.setItem(row, 0, QtWidgets.QTableWidgetItem(result["filter"]))
+                table.setItem(row, 1, QtWidgets.QTableWidgetItem(", ".join(result["all_pass"]) or "None"))
+                table.setItem(row, 2, QtWidgets.QTableWidgetItem(f"{result['score']:.4g}"))
+            table.selectRow(0)
+
+        run_button.clicked.connect(run)
+        apply_button.clicked.connect(self.sweep_dialog.accept)
+        for widget in (metric_combobox, run_button, table, apply_button):
+            layout.addWidget(widget)
+        self.sweep_dialog.setLayout(layout)
+
+        if self.sweep_dialog.exec_() != QtWidgets.QDialog.Accepted or not results:
+            return None
+        return results[max(table.currentRow(), 0)]
+
+    def apply_sweep_result(self, result):
+        """Load the base filter and all-pass sections of a sweep result."""
+        self.model.apply_sweep_result(result)
+        self.update_plot()
+
+    def openEqualizerPopup(self):
+        """Ask for the number of sections and equalize the phase of the z-plane filter."""
+        if not len(self.model.root_index):
+            return None
+        n_sections, ok = QtWidgets.QInputDialog.getInt(None, "Equalize Phase", "All-pass sections:", 4, 1, 16)
+        if not ok:
+            return None
+        QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            result = self.model.equalize_phase(n_sections)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.update_plot()
+        print(f"Group delay spread over the band: {result['before']:.3f} -> {result['after']:.3f} samples")
+        return result
 
     def update_z_plane_from_filter(self):
         """Update Z-plane with zeros and poles of the selected filter."""
-        if self.filter_selection == "None":
-            self.zeros.clear()
-            self.poles.clear()
-        else:
-            # Get numerator (b) and denominator (a) coefficients
-            b, a = self.filter_library[self.filter_selection]()
-            # Compute zeros and poles
-            self.zeros = list(np.roots(b))  # Zeros of the filter
-            self.poles = list(np.roots(a))  # Poles of the filter
-
-        self.save_state()
+        self.model.load_selected_filter()
         self.update_plot()
 
     def update_unit_circle(self):
@@ -172,23 +210,24 @@ class ZPlaneController:
 
     def update_frequency_response(self):
         """Update the magnitude and phase response plots."""
-        if not (self.zeros or self.poles):
+        method, _ = PHASE_VIEWS[self.phase_view]
+        response = self.model.frequency_response(method)
+        if response is None:
             self.mag_response.setData([], [])
             self.phase_response.setData([], [])
             return
 
-        if self.all_pass_add_radioButton.isChecked():
-            b = np.poly(self.combined_zeros)  # Numerator coefficients
-            a = np.poly(self.combined_poles)  # Numerator coefficients
-        else:
-            # Convert zeros and poles to a transfer function
-            b = np.poly(self.zeros)  # Numerator coefficients
-            a = np.poly(self.poles)  # Denominator coefficients
-        w, h = freqz(b, a, worN=500)  # Frequency response
+        # Update magnitude and phase response (or the phase view selected with set_phase_view)
+        w, magnitude, phase = response
+        self.mag_response.setData(w / (np.pi / 2), magnitude)  # Scale x-axis
+        self.phase_response.setData(w / (np.pi / 2), phase)
 
-        # Update magnitude and phase response
-        self.mag_response.setData(w / (np.pi / 2), np.abs(h))  # Scale x-axis
-        self.phase_response.setData(w / (np.pi / 2), np.angle(h))
+    def set_phase_view(self, view):
+        """Show the wrapped phase, the unwrapped phase or the group delay (a PHASE_VIEWS key)."""
+        self.phase_view = view
+        self.phase_plot_widget.setLabel("left", PHASE_VIEWS[view][1])
+        self.update_frequency_response()
+        self.phase_plot_widget.enableAutoRange()
 
     def configure_x_axis(self, plot_widget):
         """Configure the x-axis to display ticks in multiples of π/2."""
@@ -198,19 +237,15 @@ class ZPlaneController:
         axis.setTicks(ticks)
 
     def update_plot(self):
-        """Update the Z-plane plot with zeros and poles."""
-        # Start with the current filter's zeros and poles
-        self.combined_zeros = self.zeros.copy()
-        self.combined_poles = self.poles.copy()
-        if self.all_pass_add_radioButton.isChecked():
-
-            # Include selected all-pass filters
-            for filter in self.selected_all_pass_filters:
-                self.combined_zeros.extend(filter['zeros'])
-                self.combined_poles.extend(filter['poles'])
-
-        self.scatter_zeros.setData([z.real for z in self.combined_zeros], [z.imag for z in self.combined_zeros])
-        self.scatter_poles.setData([p.real for p in self.combined_poles], [p.imag for p in self.combined_poles])
+        """Redraw the Z-plane and the responses from the model."""
+        # Mirror the model in the radio buttons; the toggle is then a no-op for the model
+        button = self.all_pass_add_radioButton if self.model.all_pass_enabled else self.all_pass_remove_radioButton
+        if not button.isChecked():
+            button.setChecked(True)
+
+        zeros, poles = self.model.combined_roots()
+        self.scatter_zeros.setData([z.real for z in zeros], [z.imag for z in zeros])
+        self.scatter_poles.setData([p.real for p in poles], [p.imag for p in poles])
         self.update_frequency_response()
 
     def on_mouse_click(self, event):
@@ -223,10 +258,51 @@ class ZPlaneController:
         if np.sqrt(x ** 2 + y ** 2) > 1.2:  # Limit placement outside the unit circle range
             return
 
-        if event.button() == Qt.LeftButton:
-            self.add_zero_or_pole(x, y)
-        elif event.button() == Qt.RightButton:
-            self.remove_closest_element(x, y)
+        with perf_monitor.stage("click_to_response"):
+            if event.button() == Qt.LeftButton:
+                self.add_zero_or_pole(x, y)
+            elif event.button() == Qt.RightButton:
+                self.remove_closest_element(x, y)
+            self.repaint_for_timing()
+
+    def repaint_for_timing(self):
+        """While instrumentation is on, paint the z-plane and response plots immediately so painting is timed."""
+        if not perf_monitor.enabled:
+            return
+        with perf_monitor.stage("zplane.paint"):
+            for widget in (self.plot_widget, self.mag_plot_widget, self.phase_plot_widget):
+                widget.viewport().repaint()
+
+    def on_mouse_drag(self, event, axis=None):
+        """Drag the zero or pole under the cursor, moving its conjugate along with it."""
+        view_box = self.plot_widget.getViewBox()
+        if event.button() != Qt.LeftButton:
+            ViewBox.mouseDragEvent(view_box, event, axis)
+            return
+
+        if event.isStart():
+            start = view_box.mapSceneToView(event.buttonDownScenePos())
+            self.drag_target = self.model.find_root(complex(start.x(), start.y()), self.drag_hit_radius)
+        if self.drag_target is None:
+            ViewBox.mouseDragEvent(view_box, event, axis)  # Nothing grabbed: pan as usual
+            return
+
+        event.accept()
+        mouse_point = view_box.mapSceneToView(event.scenePos())
+        root_id, conjugate_id = self.drag_target
+        self.model.move_root(root_id, complex(mouse_point.x(), mouse_point.y()), conjugate_id)
+
+        if event.isFinish():
+            # Record the move and refresh the response at full precision
+            self.drag_timer.stop()
+            self.drag_target = None
+            self.model.commit()
+            self.update_plot()
+            self.model.refine_response()
+            self.update_frequency_response()
+        elif not self.drag_timer.isActive():
+            # Latest wins: the pending update reads whatever position is current when it fires
+            self.drag_timer.start()
 
     def add_zero_or_pole(self, x, y):
         """Add zero or pole and optionally its conjugate."""
@@ -235,85 +311,44 @@ class ZPlaneController:
         if not (is_zero or is_pole):
             return
 
-        target_list = self.zeros if is_zero else self.poles
-        target_list.append(complex(x, y))
-
-        # Add conjugate if checkbox is checked
-        if self.add_conjugate_checkbox.isChecked() and y != 0:
-            target_list.append(complex(x, -y))
-
-        self.save_state()
+        self.model.add_root(complex(x, y), "zero" if is_zero else "pole", self.add_conjugate_checkbox.isChecked())
         self.update_plot()
 
     def remove_closest_element(self, x, y):
         """Remove the closest zero or pole."""
-        all_elements = self.zeros + self.poles
-        if not all_elements:
-            return
-
-        closest = min(all_elements, key=lambda z: abs(z - complex(x, y)))
-        if closest in self.zeros:
-            self.zeros.remove(closest)
-        elif closest in self.poles:
-            self.poles.remove(closest)
-
-        self.save_state()
-        self.update_plot()
-
-    def get_filter_coefficients(self):
-        """Get filter coefficients from the current zeros and poles."""
-        if not (self.zeros or self.poles):
-            return [1], [1]  # Default: No filtering
-        if self.all_pass_add_radioButton.isChecked:
-            b = np.poly(self.combined_zeros)  # Numerator coefficients
-            a = np.poly(self.combined_poles)  # Denominator coefficients
-        else:
-            b = np.poly(self.zeros)  # Numerator coefficients
-            a = np.poly(self.poles)  # Denominator coefficients
-        return b, a
-
-    def save_state(self):
-        """Save the current state for undo/redo functionality."""
-        self.history.append((self.zeros[:], self.poles[:]))
-        self.redo_stack.clear()
+        if self.model.remove_nearest(complex(x, y)):
+            self.update_plot()
 
     def undo(self):
         """Undo the last operation."""
-        if not self.history:
-            return
-        self.redo_stack.append((self.zeros[:], self.poles[:]))
-        self.zeros, self.poles = self.history.pop()
-        self.update_plot()
+        if self.model.undo():
+            self.update_plot()
 
     def redo(self):
         """Redo the last undone operation."""
-        if not self.redo_stack:
-            return
-        self.history.append((self.zeros[:], self.poles[:]))
-        self.zeros, self.poles = self.redo_stack.pop()
-        self.update_plot()
+        if self.model.redo():
+            self.update_plot()
 
     def clear_zeros(self):
         """Clear all zeros."""
-        self.zeros.clear()
-        self.save_state()
+        self.model.clear("zero")
         self.update_plot()
 
     def clear_poles(self):
         """Clear all poles."""
-        self.poles.clear()
-        self.save_state()
+        self.model.clear("pole")
         self.update_plot()
 
     def clear_all(self):
         """Clear all zeros and poles."""
-        self.zeros.clear()
-        self.poles.clear()
-        self.save_state()
+        self.model.clear()
         self.update_plot()
 
     def save_to_file(self):
         """Save zeros and poles to a CSV file with a user-specified name and directory."""
+        from tkinter import Tk
+        from tkinter.filedialog import asksaveasfilename
+
         # Initialize Tkinter and hide the root window
         root = Tk()
         root.withdraw()
@@ -321,7 +356,7 @@ class ZPlaneController:
         # Prompt user to choose a file location and name
         filepath = asksaveasfilename(
             title="Save Filter Data",
-            filetypes=[("CSV Files", "*.csv")],
+            filetypes=[("CSV Files", "*.csv"), ("Filter Files", "*.npz")],
             defaultextension=".csv"
         )
 
@@ -329,19 +364,15 @@ class ZPlaneController:
         if not filepath:
             return
 
-        # Save zeros and poles to the selected file
-        with open(filepath, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Type", "Real", "Imaginary"])
-            for z in self.zeros:
-                writer.writerow(["Zero", z.real, z.imag])
-            for p in self.poles:
-                writer.writerow(["Pole", p.real, p.imag])
-
+        # Save zeros and poles to the selected file; the binary format also keeps the all-pass selection
+        self.model.save_file(filepath)
         print(f"Filter data successfully saved to {filepath}")
 
     def load_from_file(self):
         """Load zeros and poles from a user-selected CSV file."""
+        from tkinter import Tk
+        from tkinter.filedialog import askopenfilename
+
         # Initialize Tkinter and hide the root window
         root = Tk()
         root.withdraw()
@@ -349,7 +380,7 @@ class ZPlaneController:
         # Prompt user to choose a file to load
         filepath = askopenfilename(
             title="Load Filter Data",
-            filetypes=[("CSV Files", "*.csv")]
+            filetypes=[("Filter Files", "*.csv *.npz")]
         )
 
         # Exit if the user cancels the dialog
@@ -361,98 +392,51 @@ class ZPlaneController:
             print(f"Error: File {filepath} does not exist.")
             return
 
-        # Load zeros and poles from the selected file
-        with open(filepath, 'r') as file:
-            reader = csv.reader(file)
-            next(reader)  # Skip header
-            self.zeros.clear()
-            self.poles.clear()
-            for row in reader:
-                if row[0] == "Zero":
-                    self.zeros.append(complex(float(row[1]), float(row[2])))
-                elif row[0] == "Pole":
-                    self.poles.append(complex(float(row[1]), float(row[2])))
-
-        # Update application state and visuals
-        self.save_state()
+        # Load zeros and poles from the selected file and update visuals
+        try:
+            self.model.load_file(filepath)
+        except ValueError as error:
+            print(f"Error: {error}")
+            return
         self.update_plot()
         print(f"Filter data successfully loaded from {filepath}")
 
     def swap_zeros_poles(self):
         """Swap zeros and poles."""
-        self.zeros, self.poles = self.poles, self.zeros
-        self.save_state()
+        self.model.swap_zeros_poles()
         self.update_plot()
 
+    def export_filter_to_c(self, directory=None, precision="float", name="digital_filter"):
+        """Write the current design as a C biquad cascade (with a benchmark harness) into a directory."""
+        if directory is None:
+            from tkinter import Tk
+            from tkinter.filedialog import askdirectory
+
+            root = Tk()
+            root.withdraw()
+            directory = askdirectory(title="Export Filter to C")
+            if not directory:
+                return None
+
+        try:
+            paths = self.model.export_c(directory, precision=precision, name=name)
+        except ValueError as error:
+            print(f"Error: {error}")
+            return None
+        print(f"C code written to {', '.join(paths)}")
+        return paths
+
     def draw_direct_form_ii_diagram(self):
-        """Draw Direct Form II realization using SchemDraw."""
-
-        # Get filter coefficients
-        b_coeffs, a_coeffs = self.get_filter_coefficients()
-
-        # Normalize coefficients if a[0] != 1
-        if a_coeffs[0] != 1:
-            b_coeffs = b_coeffs / a_coeffs[0]
-            a_coeffs = a_coeffs / a_coeffs[0]
-        # Start drawing the circuit
-        with schemdraw.Drawing() as d:
-            d.config(unit=2)  # Set unit scale for spacing
-
-            # Input signal
-            d.add(elm.SourceV().label("x[n]", loc='left'))  # x_in
-
-            # First Summation Node (Input to Feedforward and Feedback Paths)
-            sum_node1 = d.add(elm.Dot(open=True).label("Σ", loc='center'))
-
-            # Feedforward Path (b-coefficients)
-            current = sum_node1
-            for i, b in enumerate(b_coeffs):
-                # d.add(elm.Rect(w=2, h=1).label(f"b{i}={b:.2f}", loc='center')) #coeff_block
-                # d.add(elm.Line().down().length(1.5))
-
-                d.add(elm.Line(w=1, h=1).label(f"b{i}={b:.2f}", loc='center'))
-                if i == 0:
-                    d.add(elm.Dot(open=True).label("y[n]", loc='center')) #output
-
-            # Feedback Path (a-coefficients)
-            current = sum_node1
-            delay_blocks = []
-
-            for i, a in enumerate(a_coeffs[1:], start=1):  # Skip a[0] (assumed 1)
-                d.add(elm.Line().down().length(1.5))
-                delay = d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
-                delay_blocks.append(delay)
-                d.add(elm.Line().left().length(1.5))
-                # d.add(elm.Rect(w=2, h=1).label(f"a{i}={a:.2f}", loc='center'))
-                d.add(elm.Line(w=2, h=1).label(f"a{i}={a:.2f}", loc='center'))
-
-            # Shared Delay Line (Z⁻¹ blocks)
-            shared_delay_start = sum_node1
-            for _ in range(max(len(a_coeffs), len(b_coeffs)) - 1):
-                d.add(elm.Line().down().length(2))
-                d.add(elm.Rect(w=2, h=1).label("Z⁻¹", loc='center'))
-                d.add(elm.Line().down().length(2).at(shared_delay_start.end))
-
-            # Save the diagram
-            file_path = "static/images/direct_form_ii_diagram.png"
-            d.save(file_path)
-
-        return file_path
+        """Draw the Direct Form II realization of the current filter as SVG bytes."""
+        b_coeffs, a_coeffs = self.model.get_filter_coefficients()
+        return draw_direct_form_ii(b_coeffs, a_coeffs)
 
     def display_circuit_in_groupbox(self):
-        """Display the generated circuit diagram in a PyQt GroupBox."""
-        # Generate the diagram
-        diagram_path = self.draw_direct_form_ii_diagram()
-
-        # Load the diagram into a QLabel
-        pixmap = QPixmap(diagram_path)
-
-        # Create a QLabel to hold the image
-        diagram_label = QLabel()
-        diagram_label.setPixmap(pixmap)
-        diagram_label.setScaledContents(True)  # Scale the image to fit
-
-        # Add the QLabel to the filter_realization_groupBox
-        layout = QVBoxLayout(self.realization_plot)  # Assuming QVBoxLayout
-        layout.addWidget(diagram_label)
-        self.realization_plot.setLayout(layout)
+        """Show the realization diagram in the group box, drawing it off the GUI thread when not cached."""
+        b_coeffs, a_coeffs = self.model.get_filter_coefficients()
+        if not self.diagram_renderer.request(b_coeffs, a_coeffs, self.realization_plot.size()):
+            if self.realization_plot.pixmap() is None or self.realization_plot.pixmap().isNull():
+                self.realization_plot.setText("Drawing diagram...")
+
+    def show_diagram(self, image):
+        self.realization_plot.setPixmap(QPixmap.fromImage(image))
@@ -285,6 +285,17 @@ class Ui_MainWindow(object):
         self.create_button.setStyleSheet(BUTTON_STYLESHEET + "border-radius:10px;")
         self.create_button.setObjectName("create_button")
 
+        self.sweep_button = QtWidgets.QPushButton(self.controls_widget)
+        self.sweep_button.setGeometry(QtCore.QRect(605, 12, 110, 37))
+        self.sweep_button.setMaximumSize(QtCore.QSize(240, 40))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        self.sweep_button.setFont(font)
+        self.sweep_button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.sweep_button.setStyleSheet(BUTTON_STYLESHEET + "border-radius:10px;")
+        self.sweep_button.setObjectName("sweep_button")
+
     def setupFrequencyResponse(self):
         """
         Creates the horizontal layout for magnitude response & phase response group boxes.
@@ -308,6 +319,11 @@ class Ui_MainWindow(object):
         self.phase_response_groupbox.setObjectName("phase_response_groupbox")
         self.phase_plot_widget = self.addGraphView(self.phase_response_groupbox)
 
+        # Phase, unwrapped phase or group delay
+        self.phase_view_combobox = QtWidgets.QComboBox(self.phase_response_groupbox)
+        self.phase_view_combobox.setObjectName("phase_view_combobox")
+        self.phase_response_groupbox.layout().insertWidget(0, self.phase_view_combobox)
+
         self.frequency_response_layout.addWidget(self.phase_response_groupbox)
 
     def setupZPlane(self):
@@ -404,6 +420,28 @@ class Ui_MainWindow(object):
         """)
         self.clear_all_button.setObjectName("clear_all_button")
 
+        # Equalize phase
+        self.equalize_button = QtWidgets.QPushButton(self.z_plane_widget)
+        self.equalize_button.setGeometry(QtCore.QRect(740, 255, 101, 38))
+        self.equalize_button.setMaximumSize(QtCore.QSize(240, 40))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        self.equalize_button.setFont(font)
+        self.equalize_button.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.equalize_button.setStyleSheet("""
+            QPushButton {
+                color: #809099;
+                background-color: rgba(255, 255, 255, 0);
+                border: 3px solid #809099;
+                padding: 3px;
+            }
+            QPushButton:hover {
+                background-color: rgba(255, 255, 255, 70);
+            }
+        """)
+        self.equalize_button.setObjectName("equalize_button")
+
         # Undo
         self.undo_button = QtWidgets.QPushButton(self.z_plane_widget)
         self.undo_button.setGeometry(QtCore.QRect(721, 300, 59, 31))
@@ -488,24 +526,24 @@ class Ui_MainWindow(object):
         self.filter_realizaion_structure.setObjectName("filter_realizaion_structure")
         self.filter_realizaion_structure.setText("Structure")
 
-        # self.filter_realization_code = QtWidgets.QPushButton(self.filter_realization_groupBox)
-        # self.filter_realization_code.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
-        # self.filter_realization_code.setGeometry(QtCore.QRect(100, 5, 84, 25))
-        # self.filter_realization_code.setFont(font)
-        # self.filter_realization_code.setStyleSheet("""
-        #     QPushButton {
-        #         color: rgb(0, 0, 0);
-        #         background-color: rgba(255, 255, 255, 0);
-        #         border: 2px solid #809099;
-        #         padding: 1px;
-        #         border-radius: 7px;
-        #     }
-        #     QPushButton:hover {
-        #         background-color: rgba(255, 255, 255, 70);
-        #     }
-        # """)
-        # self.filter_realization_code.setObjectName("filter_realization_code")
-        # self.filter_realization_code.setText("Code")
+        self.filter_realization_code = QtWidgets.QPushButton(self.filter_realization_groupBox)
+        self.filter_realization_code.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.filter_realization_code.setGeometry(QtCore.QRect(100, 5, 84, 25))
+        self.filter_realization_code.setFont(font)
+        self.filter_realization_code.setStyleSheet("""
+            QPushButton {
+                color: rgb(0, 0, 0);
+                background-color: rgba(255, 255, 255, 0);
+                border: 2px solid #809099;
+                padding: 1px;
+                border-radius: 7px;
+            }
+            QPushButton:hover {
+                background-color: rgba(255, 255, 255, 70);
+            }
+        """)
+        self.filter_realization_code.setObjectName("filter_realization_code")
+        self.filter_realization_code.setText("Code")
 
         # Label for Diagram
         self.filter_realization_diagram_label = QtWidgets.QLabel(self.filter_realization_groupBox)
@@ -557,6 +595,7 @@ class Ui_MainWindow(object):
         self.poles_radioButton.setText(_translate("MainWindow", "Poles"))
         self.swap_button.setText(_translate("MainWindow", "Swap"))
         self.create_button.setText(_translate("MainWindow", "Create"))
+        self.sweep_button.setText(_translate("MainWindow", "Sweep"))
         self.all_pass_add_radioButton.setText(_translate("MainWindow", "apAdd"))
         self.all_pass_remove_radioButton.setText(_translate("MainWindow", "apRemove"))
 
@@ -569,6 +608,7 @@ class Ui_MainWindow(object):
         self.select_all_pass_filters_button.setText(_translate("MainWindow", "All Pass"))
         self.clear_poles_button.setText(_translate("MainWindow", "Clear Pole"))
         self.clear_all_button.setText(_translate("MainWindow", "Clear ALL"))
+        self.equalize_button.setText(_translate("MainWindow", "Equalize"))
         self.undo_button.setText(_translate("MainWindow", "Undo"))
         self.redo_button.setText(_translate("MainWindow", "Redo"))
         self.z_plane_plot_groupbox.setTitle(_translate("MainWindow", "Z Plane"))
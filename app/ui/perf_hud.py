@@ -0,0 +1,50 @@
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+HUD_STYLESHEET = """
+QLabel {
+    color: #fff;
+    background-color: rgba(0, 0, 0, 160);
+    border-radius: 6px;
+    padding: 6px;
+}
+"""
+
+
+class PerfHUD(QtWidgets.QLabel):
+    """On-screen overlay listing p50/p95/p99 latency per instrumented stage."""
+
+    def __init__(self, monitor, parent=None, interval_ms=500):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.setStyleSheet(HUD_STYLESHEET)
+        font = QtGui.QFont("Courier New")
+        font.setStyleHint(QtGui.QFont.Monospace)
+        font.setPointSize(9)
+        self.setFont(font)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.move(10, 10)
+        self.hide()
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+
+    def toggle(self):
+        """Show or hide the overlay, enabling the monitor only while it is visible."""
+        visible = not self.isVisible()
+        self.monitor.set_enabled(visible)
+        self.setVisible(visible)
+        if visible:
+            self.refresh()
+            self.raise_()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def refresh(self):
+        lines = [f"{'stage':<28}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"]
+        for name, stage in sorted(self.monitor.stats().items()):
+            lines.append(f"{name:<28}{stage['count']:>7}{stage['p50_ms']:>9.2f}"
+                         f"{stage['p95_ms']:>9.2f}{stage['p99_ms']:>9.2f}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
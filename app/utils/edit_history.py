@@ -0,0 +1,171 @@
+import sys
+from collections import deque
+
+
+def _estimate_size(obj):
+    """Approximate memory held by `obj` and the containers nested in it, in bytes."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_estimate_size(key) + _estimate_size(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_estimate_size(item) for item in obj)
+    return size
+
+
+class EditHistory:
+    """
+    Bounded undo/redo log of edit deltas.
+
+    Edits are passed to `record` as they happen and grouped into one undoable
+    command by `commit`. Undo and redo hand each delta of a command to
+    `apply_delta(delta, inverse)`, so their cost follows the size of the edit
+    rather than the size of the design. Consecutive ("move", id, old, new)
+    deltas of the same id within a command are merged, so a drag is stored
+    as a single move.
+
+    Every `checkpoint_interval` commands the full `snapshot()` is kept too;
+    if a delta cannot be replayed, the state is rebuilt from the nearest
+    earlier checkpoint instead; checkpoints larger than a quarter of
+    `memory_limit` are skipped. Once the estimated size of the log exceeds
+    `memory_limit` bytes, the oldest commands are evicted.
+    """
+
+    def __init__(self, apply_delta, snapshot, restore, memory_limit=8 * 1024 * 1024, checkpoint_interval=50):
+        self.apply_delta = apply_delta
+        self.snapshot = snapshot
+        self.restore = restore
+        self.memory_limit = memory_limit
+        self.checkpoint_interval = checkpoint_interval
+
+        self.undo_stack = deque()  # Commands as {"deltas", "size", "checkpoint"}, oldest first
+        self.redo_stack = []
+        self.pending = []
+        self.pending_moves = {}  # id -> index of its move in `pending`
+        self.base = None  # State before the oldest command, None when unknown
+        self.memory_used = 0
+        self.clear()
+        self.commands_committed = 0
+        self.commands_evicted = 0
+
+    def record(self, delta):
+        """Add one delta to the command being built."""
+        if delta[0] == "move":
+            index = self.pending_moves.get(delta[1])
+            if index is not None:
+                self.pending[index] = ("move", delta[1], self.pending[index][2], delta[3])
+                return
+            self.pending_moves[delta[1]] = len(self.pending)
+        else:
+            self.pending_moves.clear()
+        self.pending.append(delta)
+
+    def commit(self):
+        """Close the command being built; returns False when nothing was recorded."""
+        if not self.pending:
+            return False
+        command = {"deltas": self.pending, "checkpoint": None}
+        self.pending = []
+        self.pending_moves.clear()
+
+        self.commands_committed += 1
+        command["size"] = _estimate_size(command["deltas"])
+        if self.commands_committed % self.checkpoint_interval == 0:
+            checkpoint = self.snapshot()
+            checkpoint_size = _estimate_size(checkpoint)
+            if checkpoint_size <= self.memory_limit // 4:
+                command["checkpoint"] = checkpoint
+                command["size"] += checkpoint_size
+
+        self._drop_redo()
+        self.undo_stack.append(command)
+        self.memory_used += command["size"]
+        self._evict()
+        return True
+
+    def undo(self):
+        """Revert the last command; returns False when there is nothing to undo."""
+        self.commit()
+        if not self.undo_stack:
+            return False
+        command = self.undo_stack.pop()
+        try:
+            for delta in reversed(command["deltas"]):
+                self.apply_delta(delta, True)
+        except (KeyError, ValueError):
+            self._rebuild(len(self.undo_stack))
+        self.redo_stack.append(command)
+        return True
+
+    def redo(self):
+        """Reapply the last undone command; returns False when there is nothing to redo."""
+        self.commit()
+        if not self.redo_stack:
+            return False
+        command = self.redo_stack.pop()
+        self.undo_stack.append(command)
+        try:
+            for delta in command["deltas"]:
+                self.apply_delta(delta, False)
+        except (KeyError, ValueError):
+            self._rebuild(len(self.undo_stack))
+        return True
+
+    def clear(self):
+        """Forget every command, taking the current state as the new base."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.pending = []
+        self.pending_moves.clear()
+        self.base = self.snapshot()
+        self.memory_used = _estimate_size(self.base)
+        if self.memory_used > self.memory_limit // 4:
+            self.base, self.memory_used = None, 0
+
+    def can_undo(self):
+        return bool(self.undo_stack or self.pending)
+
+    def can_redo(self):
+        return bool(self.redo_stack) and not self.pending
+
+    def get_stats(self):
+        """Return history counters as a dict."""
+        return {
+            "undo_depth": len(self.undo_stack),
+            "redo_depth": len(self.redo_stack),
+            "memory_used": self.memory_used,
+            "memory_limit": self.memory_limit,
+            "commands_committed": self.commands_committed,
+            "commands_evicted": self.commands_evicted,
+        }
+
+    def _drop_redo(self):
+        for command in self.redo_stack:
+            self.memory_used -= command["size"]
+        self.redo_stack.clear()
+
+    def _evict(self):
+        # The newest command is always kept so the last edit can be undone
+        while self.memory_used > self.memory_limit and len(self.undo_stack) > 1:
+            command = self.undo_stack.popleft()
+            self.memory_used -= command["size"] + self._base_size()
+            # The evicted command's checkpoint is the state before the new oldest command
+            self.base = command["checkpoint"]
+            self.memory_used += self._base_size()
+            self.commands_evicted += 1
+
+    def _base_size(self):
+        return 0 if self.base is None else _estimate_size(self.base)
+
+    def _rebuild(self, count):
+        """Restore the state after the first `count` commands of the undo stack from a checkpoint."""
+        start, state = 0, self.base
+        for index in range(count - 1, -1, -1):
+            if self.undo_stack[index]["checkpoint"] is not None:
+                start, state = index + 1, self.undo_stack[index]["checkpoint"]
+                break
+        if state is None:
+            raise RuntimeError("Undo history is inconsistent and no checkpoint covers it")
+        self.restore(state)
+        for index in range(start, count):
+            for delta in self.undo_stack[index]["deltas"]:
+                self.apply_delta(delta, False)
@@ -0,0 +1,98 @@
+import csv
+import json
+
+import numpy as np
+
+
+def write_filter_csv(filepath, zeros, poles):
+    """Write zeros and poles to a CSV file with Type, Real, Imaginary columns."""
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Type", "Real", "Imaginary"])
+        for z in zeros:
+            writer.writerow(["Zero", z.real, z.imag])
+        for p in poles:
+            writer.writerow(["Pole", p.real, p.imag])
+
+
+def read_filter_csv(filepath):
+    """Read zeros and poles from a CSV file written by `write_filter_csv`."""
+    zeros, poles = [], []
+    with open(filepath, 'r') as file:
+        reader = csv.reader(file)
+        next(reader)  # Skip header
+        for row in reader:
+            if row[0] == "Zero":
+                zeros.append(complex(float(row[1]), float(row[2])))
+            elif row[0] == "Pole":
+                poles.append(complex(float(row[1]), float(row[2])))
+    return zeros, poles
+
+
+FILTER_FORMAT_VERSION = 1
+
+
+def write_filter_npz(filepath, zeros, poles, gain=1.0, sos=None, all_pass=(), metadata=None):
+    """
+    Write a filter to the binary .npz format.
+
+    Roots are stored as complex arrays, the all-pass sections (dicts with
+    'zeros' and 'poles') as one concatenated array per kind plus the number
+    of roots of each section, and `metadata` as a JSON string next to the
+    format version. `sos` is kept complex when unpaired complex roots make
+    its sections complex.
+    """
+    all_pass = list(all_pass)
+    arrays = {
+        "version": np.array(FILTER_FORMAT_VERSION),
+        "metadata": np.array(json.dumps(metadata or {})),
+        "zeros": np.asarray(zeros, dtype=complex).ravel(),
+        "poles": np.asarray(poles, dtype=complex).ravel(),
+        "gain": np.asarray(gain),
+    }
+    for kind in ("zeros", "poles"):
+        roots = [np.asarray(section[kind], dtype=complex).ravel() for section in all_pass]
+        arrays[f"all_pass_{kind}"] = np.concatenate(roots) if roots else np.zeros(0, dtype=complex)
+        arrays[f"all_pass_{kind[:-1]}_counts"] = np.array([len(r) for r in roots], dtype=np.int64)
+    if sos is not None:
+        # Unpaired complex roots give complex sections, which a float array would silently truncate
+        sos = np.asarray(sos)
+        arrays["sos"] = sos if np.iscomplexobj(sos) else sos.astype(float)
+    with open(filepath, "wb") as file:
+        np.savez(file, **arrays)
+
+
+def read_filter_metadata(filepath):
+    """Read only the format version and metadata of a .npz filter file."""
+    with np.load(filepath, allow_pickle=False) as data:
+        return _check_version(data, filepath), json.loads(str(data["metadata"]))
+
+
+def read_filter_npz(filepath):
+    """Read a filter written by `write_filter_npz` into a dict of arrays."""
+    with np.load(filepath, allow_pickle=False) as data:
+        _check_version(data, filepath)
+        zero_splits = np.cumsum(data["all_pass_zero_counts"])[:-1]
+        pole_splits = np.cumsum(data["all_pass_pole_counts"])[:-1]
+        all_pass = [
+            {"zeros": zeros, "poles": poles}
+            for zeros, poles in zip(np.split(data["all_pass_zeros"], zero_splits),
+                                    np.split(data["all_pass_poles"], pole_splits))
+        ] if len(data["all_pass_zero_counts"]) else []
+        gain = data["gain"][()]
+        return {
+            "zeros": data["zeros"],
+            "poles": data["poles"],
+            "gain": complex(gain) if np.iscomplexobj(gain) else float(gain),
+            "sos": data["sos"] if "sos" in data.files else None,
+            "all_pass": all_pass,
+            "metadata": json.loads(str(data["metadata"])),
+        }
+
+
+def _check_version(data, filepath):
+    version = int(data["version"])
+    if version > FILTER_FORMAT_VERSION:
+        raise ValueError(f"{filepath} uses filter format version {version}, newer than the supported "
+                         f"version {FILTER_FORMAT_VERSION}")
+    return version
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from app.utils.ring_buffer import RingBuffer
+
+
+class _Stage:
+    """Context manager timing one stage into the monitor."""
+    __slots__ = ("monitor", "name", "start")
+
+    def __init__(self, monitor, name):
+        self.monitor = monitor
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.monitor.record(self.name, time.perf_counter() - self.start)
+
+
+class _NullStage:
+    """Shared do-nothing stage handed out while the monitor is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class PerfMonitor:
+    """
+    Per-stage latency histograms for the interactive hot paths.
+
+    `stage(name)` times a block; `begin(name)`/`end(name)` time a pipeline
+    that spans several calls (e.g. a mouse sample until it is painted), where
+    only the first `begin` before an `end` counts. The most recent
+    `capacity` samples of each stage are kept in milliseconds. While
+    disabled, `stage` returns a shared no-op context manager and
+    `begin`/`end` return immediately. `record` and `stats` may be called
+    from different threads.
+    """
+
+    def __init__(self, enabled=False, capacity=4096):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.samples = {}
+        self.counts = {}
+        self.pending = {}
+        self.lock = threading.Lock()  # Guards samples and counts
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.pending.clear()
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def begin(self, name):
+        if self.enabled and name not in self.pending:
+            self.pending[name] = time.perf_counter()
+
+    def end(self, name):
+        if not self.enabled:
+            return
+        start = self.pending.pop(name, None)
+        if start is not None:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Add one latency sample (in seconds) to a stage."""
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = RingBuffer(self.capacity)
+                self.counts[name] = 0
+            self.samples[name].append(seconds * 1e3)
+            self.counts[name] += 1
+
+    def stats(self):
+        """Latency percentiles per stage, in milliseconds."""
+        with self.lock:
+            snapshot = {name: (np.array(buffer.view()), self.counts[name]) for name, buffer in self.samples.items()}
+        stats = {}
+        for name, (values, count) in snapshot.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            stats[name] = {
+                "count": count,
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(values.max()),
+            }
+        return stats
+
+    def dump_json(self, path):
+        """Write `stats()` to a JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.stats(), file, indent=2)
+        return path
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+        self.pending.clear()
+
+
+# Shared monitor for the whole application; set DIGITAL_FILTER_PERF=1 to enable it at startup
+perf_monitor = PerfMonitor(enabled=os.environ.get("DIGITAL_FILTER_PERF") == "1")
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity circular buffer of samples stored in one contiguous array.
+
+    Every sample is written twice, at ``i`` and ``i + capacity``, so the most
+    recent samples always form a contiguous slice and can be handed out as
+    views without copying or reordering.
+    """
+
+    def __init__(self, capacity=10000, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1.")
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(2 * self.capacity, dtype=self.dtype)
+        self._head = 0  # Next write position in [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        """Append one sample, overwriting the oldest one when full."""
+        self._data[self._head] = value
+        self._data[self._head + self.capacity] = value
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, values):
+        """Append a block of samples; only the last `capacity` of them are kept."""
+        values = np.asarray(values, dtype=self.dtype).ravel()
+        if values.size == 0:
+            return
+        if values.size > self.capacity:
+            values = values[-self.capacity:]
+
+        positions = (self._head + np.arange(values.size)) % self.capacity
+        self._data[positions] = values
+        self._data[positions + self.capacity] = values
+        self._head = (self._head + values.size) % self.capacity
+        self._size = min(self._size + values.size, self.capacity)
+
+    def view(self, length=None):
+        """Return a read-only, zero-copy view of the most recent `length` samples (oldest first)."""
+        length = self._size if length is None else min(int(length), self._size)
+        end = self._head + self.capacity
+        window = self._data[end - length:end]
+        window.flags.writeable = False
+        return window
+
+    def clear(self):
+        """Drop all samples without releasing the storage."""
+        self._head = 0
+        self._size = 0
+
+    def resize(self, capacity):
+        """Change the capacity, keeping as many of the most recent samples as fit."""
+        recent = self.view(capacity).copy()
+        self.__init__(capacity, self.dtype)
+        self.extend(recent)
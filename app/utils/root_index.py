@@ -0,0 +1,227 @@
+import itertools
+import math
+
+import numpy as np
+
+
+class RootIndex:
+    """
+    Zeros and poles held in a uniform grid over the complex plane.
+
+    Every root gets a stable integer id when it is inserted, so edits such
+    as drags, removals and undo/redo address one specific root even when
+    several share the same value. Nearest-root queries only visit the grid
+    cells around the query point, growing outwards ring by ring.
+
+    When `listener` is set it is called with one delta per edit, such as
+    ("insert", ids, values, kinds) or ("move", id, old, new); `apply`
+    replays or reverts such a delta.
+    """
+
+    def __init__(self, cell_size=0.05):
+        self.cell_size = cell_size
+        self.entries = {}  # id -> [value, kind], in insertion order
+        self.cells = {}  # (cx, cy) -> set of ids
+        self.next_id = itertools.count()
+        self._values_cache = {}
+        self.listener = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, root_id):
+        return root_id in self.entries
+
+    def _cell(self, value):
+        return math.floor(value.real / self.cell_size), math.floor(value.imag / self.cell_size)
+
+    def _add_to_cell(self, root_id, cell):
+        self.cells.setdefault(cell, set()).add(root_id)
+
+    def _remove_from_cell(self, root_id, cell):
+        bucket = self.cells[cell]
+        bucket.discard(root_id)
+        if not bucket:
+            del self.cells[cell]
+
+    def _put(self, root_id, value, kind):
+        self.entries[root_id] = [value, kind]
+        self._add_to_cell(root_id, self._cell(value))
+        self._values_cache.pop(kind, None)
+
+    def _drop(self, root_ids):
+        for root_id in root_ids:
+            if root_id not in self.entries:
+                raise KeyError(root_id)
+        removed = [(root_id, *self.entries.pop(root_id)) for root_id in root_ids]
+        for root_id, value, kind in removed:
+            self._remove_from_cell(root_id, self._cell(value))
+            self._values_cache.pop(kind, None)
+        return removed
+
+    def _notify(self, *delta):
+        if self.listener is not None:
+            self.listener(delta)
+
+    def insert(self, value, kind):
+        """Add one root of `kind` ("zero" or "pole") and return its id."""
+        value = complex(value)
+        root_id = next(self.next_id)
+        self._put(root_id, value, kind)
+        self._notify("insert", (root_id,), (value,), (kind,))
+        return root_id
+
+    def bulk_insert(self, values, kind):
+        """Add many roots of one kind at once and return their ids."""
+        values = np.atleast_1d(np.asarray(values, dtype=complex))
+        cx = np.floor(values.real / self.cell_size).astype(int)
+        cy = np.floor(values.imag / self.cell_size).astype(int)
+        ids = []
+        for value, cell in zip(values.tolist(), zip(cx.tolist(), cy.tolist())):
+            root_id = next(self.next_id)
+            self.entries[root_id] = [value, kind]
+            self._add_to_cell(root_id, cell)
+            ids.append(root_id)
+        self._values_cache.pop(kind, None)
+        if self.listener is not None and ids:
+            self._notify("insert", tuple(ids), tuple(values.tolist()), (kind,) * len(ids))
+        return ids
+
+    def remove(self, root_id):
+        """Remove one root by id."""
+        [(_, value, kind)] = self._drop((root_id,))
+        self._notify("remove", (root_id,), (value,), (kind,))
+
+    def move(self, root_id, value):
+        """Move one root to a new location, keeping its id and position in the ordering."""
+        value = complex(value)
+        entry = self.entries[root_id]
+        old_value = entry[0]
+        old_cell, new_cell = self._cell(old_value), self._cell(value)
+        if old_cell != new_cell:
+            self._remove_from_cell(root_id, old_cell)
+            self._add_to_cell(root_id, new_cell)
+        entry[0] = value
+        self._values_cache.pop(entry[1], None)
+        self._notify("move", root_id, old_value, value)
+
+    def clear(self, kind=None):
+        """Remove every root, or every root of one kind."""
+        if kind is None and self.listener is None:
+            self.entries.clear()
+            self.cells.clear()
+            self._values_cache.clear()
+            return
+        removed = self._drop(self.ids(kind))
+        if removed:
+            root_ids, values, kinds = zip(*removed)
+            self._notify("remove", root_ids, values, kinds)
+
+    def replace(self, kind, values):
+        """Replace every root of `kind` with `values`."""
+        self.clear(kind)
+        return self.bulk_insert(values, kind)
+
+    def swap_kinds(self):
+        """Turn zeros into poles and poles into zeros, keeping every id."""
+        for entry in self.entries.values():
+            entry[1] = "pole" if entry[1] == "zero" else "zero"
+        self._values_cache.clear()
+        self._notify("swap")
+
+    def apply(self, delta, inverse=False):
+        """Replay a delta passed to `listener`, or revert it when `inverse` is set, without notifying."""
+        listener, self.listener = self.listener, None
+        try:
+            action = delta[0]
+            if action == "swap":
+                self.swap_kinds()
+            elif action == "move":
+                root_id, old_value, new_value = delta[1:]
+                self.move(root_id, old_value if inverse else new_value)
+            elif (action == "insert") != inverse:
+                _, root_ids, values, kinds = delta
+                if any(root_id in self.entries for root_id in root_ids):
+                    raise KeyError("root id already present")
+                for root_id, value, kind in zip(root_ids, values, kinds):
+                    self._put(root_id, value, kind)
+            else:
+                self._drop(delta[1])
+        finally:
+            self.listener = listener
+
+    def value(self, root_id):
+        return self.entries[root_id][0]
+
+    def kind(self, root_id):
+        return self.entries[root_id][1]
+
+    def ids(self, kind=None):
+        """Ids of every root (of one kind), in insertion order."""
+        return [root_id for root_id, (_, k) in self.entries.items() if kind is None or k == kind]
+
+    def values(self, kind):
+        """Values of the roots of one kind as a new list, in insertion order."""
+        if kind not in self._values_cache:
+            self._values_cache[kind] = tuple(v for v, k in self.entries.values() if k == kind)
+        return list(self._values_cache[kind])
+
+    def snapshot(self):
+        """Copy of every (id, value, kind), for restoring the exact same roots later."""
+        return {root_id: tuple(entry) for root_id, entry in self.entries.items()}
+
+    def restore(self, snapshot):
+        """Restore the roots (with their ids) from `snapshot()` output, without notifying."""
+        self.entries.clear()
+        self.cells.clear()
+        self._values_cache.clear()
+        for root_id, (value, kind) in snapshot.items():
+            self._put(root_id, value, kind)
+
+    def nearest(self, point, kinds=("zero", "pole"), max_distance=math.inf, exclude=()):
+        """
+        Id of the root of one of `kinds` closest to `point`, or None.
+
+        Rings of cells are scanned outwards until no unvisited cell can hold
+        anything closer than the best match so far; when the rings would
+        cover more cells than there are roots, the remaining candidates are
+        checked directly instead.
+        """
+        point = complex(point)
+        if not self.entries:
+            return None
+        cx, cy = self._cell(point)
+        best_id, best_distance = None, math.inf
+
+        def consider(candidates):
+            nonlocal best_id, best_distance
+            for root_id in candidates:
+                value, kind = self.entries[root_id]
+                if kind not in kinds or root_id in exclude:
+                    continue
+                distance = abs(value - point)
+                if distance < best_distance:
+                    best_id, best_distance = root_id, distance
+
+        ring = 0
+        while True:
+            # Every cell outside rings 0..ring-1 is at least (ring - 1) cells away
+            if best_distance <= (ring - 1) * self.cell_size or (ring - 1) * self.cell_size > max_distance:
+                break
+            if (2 * ring + 1) ** 2 > 4 * len(self.entries):
+                consider(self.entries)  # The grid is sparse here: a direct scan is cheaper
+                break
+            if ring == 0:
+                consider(self.cells.get((cx, cy), ()))
+            else:
+                for dx in range(-ring, ring + 1):
+                    consider(self.cells.get((cx + dx, cy - ring), ()))
+                    consider(self.cells.get((cx + dx, cy + ring), ()))
+                for dy in range(-ring + 1, ring):
+                    consider(self.cells.get((cx - ring, cy + dy), ()))
+                    consider(self.cells.get((cx + ring, cy + dy), ()))
+            ring += 1
+
+        if best_distance > max_distance:
+            return None
+        return best_id
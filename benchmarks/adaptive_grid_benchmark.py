@@ -0,0 +1,79 @@
+"""
+Compare the adaptive frequency grid against uniform grids.
+
+For each library design, AdaptiveResponse refines its coarse grid around
+the roots near the unit circle. The table lists the number of points it
+evaluates and its error against a dense reference (magnitude relative to
+the peak, group delay in samples), next to uniform grids of 500 points
+(the former plot grid) and of the same size as the adaptive one. It also
+times a single-root move, the operation performed while dragging.
+
+Run from the repository root:
+    python -m benchmarks.adaptive_grid_benchmark --orders 4 8 12
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.filter_design import FilterDesignCache
+from app.services.frequency_response import AdaptiveResponse
+
+FAMILIES = {
+    "butter": {"family": "butter", "btype": "low", "cutoff": 0.3},
+    "cheby1": {"family": "cheby1", "btype": "low", "cutoff": 0.3, "ripple": 1},
+    "ellip": {"family": "ellip", "btype": "low", "cutoff": 0.3, "ripple": 1, "attenuation": 60},
+    "cheby1 band": {"family": "cheby1", "btype": "band", "cutoff": [0.3, 0.35], "ripple": 0.5},
+}
+
+
+def uniform_error(zeros, poles, gain, n_points, dense_points):
+    """error_bound of a uniform grid, measured the same way as the adaptive one."""
+    uniform = AdaptiveResponse(base_points=n_points, refine_distance=-1)
+    uniform.update_roots(zeros, poles, gain)
+    return uniform.error_bound(dense_points)
+
+
+def move_time(response, repeats):
+    """Median time to move one pole by a small step, as during a drag."""
+    zeros = list(response.zeros.elements())
+    poles = list(response.poles.elements())
+    times = []
+    for step in range(repeats):
+        moved = poles[:]
+        moved[0] = poles[0] * (0.999 if step % 2 else 1 / 0.999)
+        start = time.perf_counter()
+        response.update_roots(zeros, moved, response.gain)
+        times.append(time.perf_counter() - start)
+    response.update_roots(zeros, poles, response.gain)
+    return np.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, nargs="+", default=[4, 8, 12])
+    parser.add_argument("--dense", type=int, default=16384, help="Points of the dense reference grid")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    designs = FilterDesignCache()
+    header = (f"{'family':>12} {'order':>5} | {'points':>6} {'mag':>8} {'delay':>7} {'move ms':>7} | "
+              f"{'mag@500':>8} {'delay@500':>9} | {'mag@same':>8} {'delay@same':>10}")
+    print(header)
+    print("-" * len(header))
+    for family, spec in FAMILIES.items():
+        for order in args.orders:
+            zeros, poles, gain = designs.design(order=order, output="zpk", **spec)
+            adaptive = AdaptiveResponse()
+            adaptive.update_roots(zeros, poles, gain)
+            error = adaptive.error_bound(args.dense)
+            wide = uniform_error(zeros, poles, gain, 500, args.dense)
+            same = uniform_error(zeros, poles, gain, error["points"], args.dense)
+            print(f"{family:>12} {order:>5} | {error['points']:>6} {error['magnitude']:>8.1e} "
+                  f"{error['group_delay']:>7.3f} {move_time(adaptive, args.repeats) * 1e3:>7.3f} | "
+                  f"{wide['magnitude']:>8.1e} {wide['group_delay']:>9.3f} | "
+                  f"{same['magnitude']:>8.1e} {same['group_delay']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
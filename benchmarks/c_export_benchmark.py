@@ -0,0 +1,78 @@
+"""
+Compile the exported C filters with the local gcc and check them against SciPy.
+
+For each elliptic lowpass order and each precision, the cascade is exported
+with its harness, compiled, and run on white noise. Reports throughput in
+samples per second and the maximum absolute error (in full-scale units)
+against scipy.signal.sosfilt applied to the same, already quantized, input.
+
+Run from the repository root:
+    python -m benchmarks.c_export_benchmark --orders 4 8 16
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+from scipy.signal import ellip, sosfilt
+
+from app.services.c_export import PRECISIONS, export_c
+
+
+def quantized_input(signal, precision):
+    """The input as the harness sees it after converting to the sample type."""
+    if precision == "float":
+        return signal.astype(np.float32).astype(np.float64)
+    if precision == "double":
+        return signal
+    scale = 2.0 ** (PRECISIONS[precision]["bits"] - 1)
+    return np.clip(np.floor(signal * scale + 0.5), -scale, scale - 1) / scale
+
+
+def run_case(sos, precision, signal, repeats, compiler, cflags, directory):
+    export_c(sos, directory, name="exported_filter", precision=precision, harness=True)
+    executable = os.path.join(directory, "harness")
+    subprocess.run([compiler, *cflags, "-o", executable, os.path.join(directory, "harness.c"),
+                    os.path.join(directory, "exported_filter.c"), "-lm"], check=True)
+
+    input_path = os.path.join(directory, "input.f64")
+    output_path = os.path.join(directory, "output.f64")
+    signal.astype(np.float64).tofile(input_path)
+    result = subprocess.run([executable, input_path, output_path, str(repeats)],
+                            capture_output=True, text=True, check=True)
+    samples_per_second = float(result.stdout.split()[-1])
+
+    reference = sosfilt(sos, quantized_input(signal, precision))
+    error = np.max(np.abs(np.fromfile(output_path, dtype=np.float64) - reference))
+    return samples_per_second, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--precisions", nargs="+", default=list(PRECISIONS), choices=list(PRECISIONS))
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--amplitude", type=float, default=0.25, help="Peak of the test signal (full scale is 1)")
+    parser.add_argument("--cc", default=shutil.which("gcc") or "gcc", help="C compiler")
+    parser.add_argument("--cflags", default="-O3 -std=c99", help="Compiler flags")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    signal = np.clip(rng.standard_normal(args.samples) * args.amplitude / 3, -args.amplitude, args.amplitude)
+
+    header = f"{'order':>5} {'precision':>9} {'Msamples/s':>11} {'max error':>11}"
+    print(header)
+    print("-" * len(header))
+    with tempfile.TemporaryDirectory() as directory:
+        for order in args.orders:
+            sos = ellip(order, 1, 60, 0.2, output="sos")
+            for precision in args.precisions:
+                rate, error = run_case(sos, precision, signal, args.repeats, args.cc, args.cflags.split(), directory)
+                print(f"{order:>5} {precision:>9} {rate / 1e6:>11.1f} {error:>11.2e}")
+
+
+if __name__ == "__main__":
+    main()
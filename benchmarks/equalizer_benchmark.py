@@ -0,0 +1,54 @@
+"""
+Time the all-pass phase equalizer and report how much it flattens the group delay.
+
+For each library family and order, equalize_group_delay places 1 to
+--sections all-pass pairs over the passband. The table lists the median
+wall time and the group-delay standard deviation over the band, in samples,
+before and after.
+
+Run from the repository root:
+    python -m benchmarks.equalizer_benchmark --orders 4 8 --sections 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.filter_design import FilterDesignCache
+from app.services.phase_equalizer import equalize_group_delay
+
+FAMILIES = {
+    "butter": {"family": "butter", "btype": "low", "cutoff": 0.4},
+    "cheby1": {"family": "cheby1", "btype": "low", "cutoff": 0.4, "ripple": 1},
+    "ellip": {"family": "ellip", "btype": "low", "cutoff": 0.4, "ripple": 1, "attenuation": 40},
+    "cheby1 band": {"family": "cheby1", "btype": "band", "cutoff": [0.3, 0.6], "ripple": 1},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, nargs="+", default=[4, 6, 8])
+    parser.add_argument("--sections", type=int, default=8, help="Largest number of all-pass sections")
+    parser.add_argument("--starts", type=int, default=32, help="Starting points optimized together")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    designs = FilterDesignCache()
+    header = f"{'family':>12} {'order':>5} {'sections':>8} {'ms':>8} {'before':>9} {'after':>9}"
+    print(header)
+    print("-" * len(header))
+    for family, spec in FAMILIES.items():
+        for order in args.orders:
+            zeros, poles, _ = designs.design(order=order, output="zpk", **spec)
+            for n_sections in range(1, args.sections + 1):
+                times = []
+                for _ in range(args.repeats):
+                    start = time.perf_counter()
+                    result = equalize_group_delay(zeros, poles, n_sections, n_starts=args.starts)
+                    times.append(time.perf_counter() - start)
+                print(f"{family:>12} {order:>5} {n_sections:>8} {np.median(times) * 1e3:>8.1f} "
+                      f"{result['before']:>9.3f} {result['after']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmark suite for the DSP and rendering hot paths of the interactive loop.
+
+Builds the real main window on Qt's offscreen platform and times
+ZPlaneController.update_plot, update_frequency_response,
+update_z_plane_from_filter and draw_direct_form_ii_diagram,
+FilterModel.get_filter_coefficients, and MouseSignalInput.apply_filter (until the
+engine thread has re-filtered the history), sweeping filter order, signal length and the number of enabled all-pass sections.
+Each case runs once untimed before its timed repetitions.
+
+Results are written as JSON; pass --baseline to compare against a stored
+run and exit with status 1 when any case slows down beyond --tolerance.
+
+Run from the repository root:
+    python -m benchmarks.hot_paths_benchmark --output results.json
+    python -m benchmarks.hot_paths_benchmark --baseline results.json --quick
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("MPLBACKEND", "Agg")  # Keep schemdraw from opening a blocking figure window
+
+import numpy as np
+import scipy
+from PyQt5 import QtWidgets
+
+from app.controller import MainWindowController
+from app.services.frequency_response import AdaptiveResponse
+
+ORDERS = [2, 4, 8, 16, 32, 64, 128, 256]
+SIGNAL_LENGTHS = [100, 1_000, 10_000, 100_000, 1_000_000]
+ALL_PASS_COUNTS = [0, 1, 2, 4, 8, 16]
+DIAGRAM_ORDERS = [2, 4, 8]
+
+QUICK_ORDERS = [2, 16, 64]
+QUICK_SIGNAL_LENGTHS = [100, 10_000]
+QUICK_ALL_PASS_COUNTS = [0, 4]
+QUICK_DIAGRAM_ORDERS = [2]
+
+
+def random_roots(order, radius, rng):
+    """`order` roots in conjugate pairs (plus one real root for odd orders) within `radius`."""
+    r = radius * np.sqrt(rng.random(order // 2))
+    theta = np.pi * rng.random(order // 2)
+    upper = r * np.exp(1j * theta)
+    roots = list(np.concatenate([upper, np.conj(upper)]))
+    if order % 2:
+        roots.append(complex(radius * (2 * rng.random() - 1), 0))
+    return roots
+
+
+def measure(func, repeats, setup=None):
+    """
+    Time `func()` `repeats` times, running the untimed `setup()` before each call.
+
+    One untimed warmup call comes first, so lazy imports and first-call
+    caches are not charged to whichever case happens to run first.
+    """
+    if setup is not None:
+        setup()
+    func()
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"median_s": float(np.median(times)), "min_s": float(np.min(times)), "repeats": repeats}
+
+
+class HotPathBenchmarks:
+    def __init__(self, repeats):
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+        self.window = MainWindowController(self.app)
+        self.zplane = self.window.zplane_controller
+        self.model = self.zplane.model
+        self.mouse = self.window.mouse_signal_input
+        self.repeats = repeats
+        self.rng = np.random.default_rng(0)
+        self.results = []
+
+    def record(self, name, params, timing):
+        self.results.append({"benchmark": name, "params": params, **timing})
+        print(f"{name:<30} {json.dumps(params):<36} median {timing['median_s'] * 1e3:9.3f} ms")
+
+    def load_roots(self, order):
+        """Place a random design of `order` on the z-plane with no library filter or all-pass."""
+        self.model.filter_selection = "None"
+        self.model.set_all_pass(enabled=False)
+        self.model.zeros = random_roots(order, 1.2, self.rng)
+        self.model.poles = random_roots(order, 0.95, self.rng)
+        self.zplane.update_plot()
+
+    def nudge_one_root(self):
+        """Move one pole slightly, like a single interactive edit."""
+        root_id = self.model.root_index.ids("pole")[0]
+        self.model.move_root(root_id, self.model.root_index.value(root_id) * 0.999)
+
+    def cold_response(self):
+        self.model.response = AdaptiveResponse()
+
+    def run_order_sweep(self, orders):
+        for order in orders:
+            self.load_roots(order)
+            params = {"order": order}
+            self.record("update_plot", params, measure(self.zplane.update_plot, self.repeats, self.nudge_one_root))
+            self.record("update_frequency_response", params,
+                        measure(self.zplane.update_frequency_response, self.repeats, self.cold_response))
+            self.record("get_filter_coefficients", params,
+                        measure(self.model.get_filter_coefficients, self.repeats, self.model.coefficient_cache.clear))
+
+            # Zero-pole-gain design of a library filter of this order, from a cold design cache
+            spec = self.model.filter_specs["Butterworth LPF"]
+            spec["order"] = order
+            self.model.filter_selection = "Butterworth LPF"
+            self.record("update_z_plane_from_filter", params,
+                        measure(self.zplane.update_z_plane_from_filter, self.repeats, self.model.design_cache.clear))
+            spec["order"] = 4
+
+    def reprime_signal(self):
+        self.mouse.apply_filter().wait()
+        self.app.processEvents()
+
+    def run_signal_sweep(self, lengths, order=8):
+        self.load_roots(order)
+        for length in lengths:
+            self.mouse.set_max_length(length)
+            self.mouse.signal.extend(self.rng.standard_normal(length))
+            self.record("apply_filter", {"order": order, "signal_length": length},
+                        measure(self.reprime_signal, self.repeats))
+        self.mouse.set_max_length(10000)
+        self.mouse.reset()
+
+    def run_all_pass_sweep(self, counts, signal_length=10_000):
+        self.model.filter_selection = "Elliptic LPF"
+        self.zplane.update_z_plane_from_filter()
+        self.mouse.signal.extend(self.rng.standard_normal(signal_length))
+        library = list(self.model.all_pass_filter_library.values())
+        for count in counts:
+            self.model.set_all_pass([library[i % len(library)] for i in range(count)], count > 0)
+            params = {"all_pass_sections": count, "signal_length": signal_length}
+            self.record("update_plot", params, measure(self.zplane.update_plot, self.repeats, self.cold_response))
+            self.record("apply_filter", params, measure(self.reprime_signal, self.repeats))
+        self.model.set_all_pass([], False)
+        self.mouse.reset()
+
+    def run_diagram_sweep(self, orders):
+        for order in orders:
+            self.load_roots(order)
+            self.record("draw_direct_form_ii_diagram", {"order": order},
+                        measure(self.zplane.draw_direct_form_ii_diagram, max(1, self.repeats // 3)))
+
+
+def compare(results, baseline, tolerance):
+    """Print the ratio of each case to the baseline and return the regressed cases."""
+    reference = {(r["benchmark"], json.dumps(r["params"], sort_keys=True)): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'benchmark':<30} {'params':<36} {'ratio':>7}")
+    for r in results:
+        key = (r["benchmark"], json.dumps(r["params"], sort_keys=True))
+        if key not in reference:
+            continue
+        ratio = r["median_s"] / reference[key]["median_s"]
+        flag = "  REGRESSION" if ratio > tolerance else ""
+        print(f"{r['benchmark']:<30} {key[1]:<36} {ratio:>7.2f}{flag}")
+        if ratio > tolerance:
+            regressions.append(r)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_output.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown ratio before flagging")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--quick", action="store_true", help="Smaller sweeps for a fast check")
+    args = parser.parse_args()
+
+    bench = HotPathBenchmarks(args.repeats)
+    bench.run_order_sweep(QUICK_ORDERS if args.quick else ORDERS)
+    bench.run_signal_sweep(QUICK_SIGNAL_LENGTHS if args.quick else SIGNAL_LENGTHS)
+    bench.run_all_pass_sweep(QUICK_ALL_PASS_COUNTS if args.quick else ALL_PASS_COUNTS)
+    bench.run_diagram_sweep(QUICK_DIAGRAM_ORDERS if args.quick else DIAGRAM_ORDERS)
+
+    output = {
+        "metadata": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+        },
+        "results": bench.results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(output, file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(bench.results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {args.tolerance}x the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Check that memory-mapped chunked filtering keeps memory bounded and exact.
+
+Writes a raw float64 signal of the requested size to a temporary directory,
+filters it file-to-file through memmaps, and reports throughput, the peak
+heap allocated while filtering (tracemalloc, which numpy reports to), and
+whether a prefix of the output is bit-for-bit equal to one sosfilt call.
+
+Run from the repository root:
+    python -m benchmarks.memmap_benchmark --samples 50000000 --chunk-size 65536
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.signal import ellip, sosfilt
+
+from app.services.batch_filter import filter_file_memmap
+
+
+def write_signal(path, n_samples, chunk_size):
+    """Write a random raw float64 signal without holding it in memory."""
+    rng = np.random.default_rng(0)
+    with open(path, 'wb') as file:
+        for start in range(0, n_samples, chunk_size):
+            rng.standard_normal(min(chunk_size, n_samples - start)).tofile(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=20_000_000)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--check", type=int, default=1_000_000, help="Prefix length compared with one sosfilt call")
+    args = parser.parse_args()
+
+    sos = ellip(8, 1, 60, 0.2, output="sos")
+    with tempfile.TemporaryDirectory() as directory:
+        in_path = os.path.join(directory, "signal.f64")
+        out_path = os.path.join(directory, "signal_filtered.f64")
+        write_signal(in_path, args.samples, args.chunk_size)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        filter_file_memmap(sos, in_path, out_path, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        check = min(args.check, args.samples)
+        prefix = np.fromfile(in_path, dtype=np.float64, count=check)
+        output = np.fromfile(out_path, dtype=np.float64, count=check)
+        identical = np.array_equal(output, sosfilt(sos, prefix))
+
+    size_mb = args.samples * 8 / 2 ** 20
+    print(f"signal size:        {size_mb:.1f} MiB ({args.samples} samples)")
+    print(f"chunk size:         {args.chunk_size} samples ({args.chunk_size * 8 / 2 ** 20:.2f} MiB)")
+    print(f"throughput:         {args.samples / elapsed / 1e6:.2f} Msamples/s")
+    print(f"peak heap:          {peak / 2 ** 20:.2f} MiB")
+    print(f"bit-exact prefix:   {identical} ({check} samples)")
+
+
+if __name__ == "__main__":
+    main()
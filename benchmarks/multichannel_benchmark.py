@@ -0,0 +1,59 @@
+"""
+Throughput of multi-channel filtering from 1 to 1024 channels.
+
+Compares a Python loop of per-channel sosfilt calls, one vectorized call
+over all channels, and the vectorized call split across a thread pool.
+
+Run from the repository root:
+    python -m benchmarks.multichannel_benchmark --threads 4
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+from scipy.signal import ellip, sosfilt
+
+from app.services.multichannel_filter import MultiChannelFilter
+
+
+def best_time(func, repeats):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 4, 16, 64, 256, 1024])
+    parser.add_argument("--samples", type=int, default=16384, help="Samples per channel")
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    sos = ellip(8, 1, 60, 0.2, output="sos")
+    rng = np.random.default_rng(0)
+
+    header = f"{'channels':>8} {'loop Msps':>10} {'vector Msps':>12} {f'{args.threads} threads Msps':>18}"
+    print(header)
+    print("-" * len(header))
+    for n_channels in args.channels:
+        block = rng.standard_normal((n_channels, args.samples))
+        total = block.size
+
+        vectorized = MultiChannelFilter(sos, n_channels)
+        threaded = MultiChannelFilter(sos, n_channels, n_threads=args.threads)
+        loop_time = best_time(lambda: [sosfilt(sos, channel) for channel in block], args.repeats)
+        vector_time = best_time(lambda: vectorized.process(block), args.repeats)
+        thread_time = best_time(lambda: threaded.process(block), args.repeats)
+        threaded.close()
+
+        print(f"{n_channels:>8} {total / loop_time / 1e6:>10.2f} {total / vector_time / 1e6:>12.2f} "
+              f"{total / thread_time / 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
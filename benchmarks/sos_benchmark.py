@@ -0,0 +1,96 @@
+"""
+Compare the np.poly transfer-function path with the second-order-section path.
+
+For Butterworth and elliptic low-pass designs of increasing order, measures
+filtering throughput (samples per second) and the error of each path:
+frequency response against direct evaluation of the zero-pole product, and
+time-domain output against an extended-precision SOS reference.
+
+Run from the repository root:
+    python -m benchmarks.sos_benchmark
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.signal import butter, ellip, freqz, lfilter, sosfilt, sosfreqz
+
+from app.services.sos_filter import roots_to_sos
+
+
+def zpk_response(zeros, poles, gain, w):
+    """Evaluate H(e^jw) directly from the roots."""
+    z = np.exp(1j * w)[:, None]
+    h = gain * np.prod(z - np.asarray(zeros)[None, :], axis=1) / np.prod(z - np.asarray(poles)[None, :], axis=1)
+    # Match the z^-1 polynomial convention used by lfilter/freqz
+    return h * np.exp(1j * w * (len(poles) - len(zeros)))
+
+
+def time_call(func, repeats):
+    """Best-of-`repeats` wall time of func()."""
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(orders, n_samples, repeats):
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(n_samples)
+    w = np.linspace(0, np.pi, 500, endpoint=False)
+    results = []
+
+    for family in ("butter", "ellip"):
+        for order in orders:
+            if family == "butter":
+                zeros, poles, gain = butter(order, 0.2, output="zpk")
+            else:
+                zeros, poles, gain = ellip(order, 1, 60, 0.2, output="zpk")
+
+            b = gain * np.poly(zeros)
+            a = np.poly(poles)
+            sos = roots_to_sos(zeros, poles, gain)
+
+            reference_h = zpk_response(zeros, poles, gain, w)
+            reference_y = sosfilt(sos.astype(np.longdouble), x.astype(np.longdouble)).astype(np.float64)
+
+            with np.errstate(all="ignore"):
+                y_poly = lfilter(b, a, x)
+                h_poly = freqz(b, a, worN=w)[1]
+            y_sos = sosfilt(sos, x)
+            h_sos = sosfreqz(sos, worN=w)[1]
+
+            results.append({
+                "family": family,
+                "order": order,
+                "poly_samples_per_s": n_samples / time_call(lambda: lfilter(b, a, x), repeats),
+                "sos_samples_per_s": n_samples / time_call(lambda: sosfilt(sos, x), repeats),
+                "poly_response_error": float(np.max(np.abs(h_poly - reference_h))),
+                "sos_response_error": float(np.max(np.abs(h_sos - reference_h))),
+                "poly_output_error": float(np.max(np.abs(y_poly - reference_y))),
+                "sos_output_error": float(np.max(np.abs(y_sos - reference_y))),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    header = f"{'family':<7} {'order':>5} {'poly Msps':>10} {'sos Msps':>10} {'poly |dH|':>10} {'sos |dH|':>10} {'poly |dy|':>10} {'sos |dy|':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in run(args.orders, args.samples, args.repeats):
+        print(f"{r['family']:<7} {r['order']:>5} "
+              f"{r['poly_samples_per_s'] / 1e6:>10.2f} {r['sos_samples_per_s'] / 1e6:>10.2f} "
+              f"{r['poly_response_error']:>10.2e} {r['sos_response_error']:>10.2e} "
+              f"{r['poly_output_error']:>10.2e} {r['sos_output_error']:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
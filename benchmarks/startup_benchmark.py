@@ -0,0 +1,145 @@
+"""
+Cold-start benchmark: import time per module and time to first frame.
+
+Every repeat runs in a fresh interpreter. Import times come from
+`python -X importtime -c "import app.controller"`; the first-frame run
+builds the main window on Qt's offscreen platform and stops at the first
+paint event, timing from the first line of the interpreter's script.
+
+Results are written as JSON; pass --baseline to compare against a stored
+run and exit with status 1 when time to first frame slows down beyond
+--tolerance.
+
+Run from the repository root:
+    python -m benchmarks.startup_benchmark --output startup.json
+    python -m benchmarks.startup_benchmark --baseline startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import numpy as np
+
+FIRST_FRAME_SCRIPT = r"""
+import time
+start = time.perf_counter()
+import json
+import sys
+from PyQt5 import QtCore, QtWidgets
+from app.controller import MainWindowController
+imported = time.perf_counter()
+
+
+class FirstFrame(QtCore.QObject):
+    painted = None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint and self.painted is None:
+            self.painted = time.perf_counter()
+            QtCore.QTimer.singleShot(0, app.quit)
+        return False
+
+
+app = QtWidgets.QApplication(sys.argv)
+first_frame = FirstFrame()
+app.installEventFilter(first_frame)
+window = MainWindowController(app)
+constructed = time.perf_counter()
+window.show()
+app.exec_()
+print(json.dumps({
+    "import_s": imported - start,
+    "construct_s": constructed - imported,
+    "first_frame_s": first_frame.painted - start,
+}))
+"""
+
+
+def child_environment():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env.setdefault("MPLBACKEND", "Agg")
+    return env
+
+
+def import_times():
+    """Self and cumulative import time (seconds) of every module loaded by `import app.controller`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.controller"],
+                            capture_output=True, text=True, env=child_environment(), check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    return times
+
+
+def first_frame():
+    # The exit status is not checked: only the timings printed before interpreter teardown matter
+    result = subprocess.run([sys.executable, "-c", FIRST_FRAME_SCRIPT], capture_output=True, text=True,
+                            env=child_environment())
+    lines = result.stdout.strip().splitlines()
+    if not lines:
+        raise RuntimeError(f"First-frame run failed with status {result.returncode}:\n{result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def summarize_imports(runs, top):
+    """Median cumulative time of the app modules and of the `top` slowest top-level packages."""
+    names = set().union(*runs)
+    medians = {name: float(np.median([run.get(name, (0, 0))[1] for run in runs])) for name in names}
+    app_modules = {name: t for name, t in medians.items() if name == "app" or name.startswith("app.")}
+    packages = sorted(((name, t) for name, t in medians.items() if "." not in name and name != "app"),
+                      key=lambda item: item[1], reverse=True)[:top]
+    return {"app_modules": app_modules, "packages": dict(packages)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="startup_output.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown ratio before flagging")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="Number of top-level packages to list")
+    args = parser.parse_args()
+
+    imports = summarize_imports([import_times() for _ in range(args.repeats)], args.top)
+    frames = [first_frame() for _ in range(args.repeats)]
+    timings = {key: float(np.median([frame[key] for frame in frames])) for key in frames[0]}
+
+    print(f"{'module':<44} {'cumulative ms':>14}")
+    for name, seconds in sorted(imports["app_modules"].items(), key=lambda item: item[1], reverse=True):
+        print(f"{name:<44} {seconds * 1e3:>14.1f}")
+    print()
+    for name, seconds in imports["packages"].items():
+        print(f"{name:<44} {seconds * 1e3:>14.1f}")
+    print()
+    for key, seconds in timings.items():
+        print(f"{key:<44} {seconds * 1e3:>14.1f}")
+
+    output = {
+        "metadata": {"python": platform.python_version(), "platform": platform.platform(), "repeats": args.repeats},
+        "imports": imports,
+        "startup": timings,
+    }
+    with open(args.output, "w") as file:
+        json.dump(output, file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["startup"]
+        print(f"\n{'stage':<44} {'ratio':>14}")
+        for key, seconds in timings.items():
+            print(f"{key:<44} {seconds / baseline[key]:>14.2f}")
+        if timings["first_frame_s"] > args.tolerance * baseline["first_frame_s"]:
+            print(f"Time to first frame is slower than {args.tolerance}x the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Apply a filter saved from the application to recorded signal files, without a GUI.
+
+Example:
+    python filter_cli.py my_filter.csv recordings/*.npy -o filtered/ --jobs 8
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.services.batch_filter import filter_files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Filter signal files with a saved z-plane filter.")
+    parser.add_argument("filter", help="Filter .csv or .npz written by the application's Save Filter button")
+    parser.add_argument("inputs", nargs="+", help="Signal files (.csv, .npy or raw .raw/.bin/.f32/.f64)")
+    parser.add_argument("-o", "--output-dir", help="Directory for the outputs (default: next to each input)")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="Samples processed per chunk")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--dtype", default="float64", help="Sample type of raw input files")
+    parser.add_argument("--column", type=int, default=0, help="Column to read from CSV inputs")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Memory-map .npy/raw inputs and outputs (for files larger than RAM)")
+    parser.add_argument("--gain", type=float, default=1.0, help="Gain applied on top of the zeros and poles")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    total = 0
+    for in_path, out_path, n_samples in filter_files(
+            args.filter, args.inputs, args.output_dir, jobs=args.jobs, gain=args.gain,
+            chunk_size=args.chunk_size, dtype=args.dtype, column=args.column, mmap=args.mmap):
+        total += n_samples
+        print(f"{in_path} -> {out_path} ({n_samples} samples)")
+
+    elapsed = time.perf_counter() - start
+    print(f"Filtered {total} samples from {len(args.inputs)} file(s) in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+import pytest
+
+from app.services.c_export import export_c
+from app.services.sos_filter import roots_to_sos
+
+
+def test_complex_sections_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="conjugate"):
+        export_c(roots_to_sos([0.5 + 0.5j], [0.3]), str(tmp_path))
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,32 @@
+import warnings
+
+import numpy as np
+
+from app.services.filter_library import FilterLibrary
+from app.utils.filter_io import read_filter_npz
+
+
+def sos_response(sos, w):
+    powers = np.exp(-1j * np.outer(np.arange(3), w))  # z^0, z^-1, z^-2
+    return np.prod([(section[:3] @ powers) / (section[3:] @ powers) for section in sos], axis=0)
+
+
+def zpk_response(zeros, poles, gain, w):
+    z = np.exp(1j * w)
+    return gain * np.prod([z - zero for zero in zeros], axis=0) / np.prod([z - pole for pole in poles], axis=0)
+
+
+def test_unpaired_complex_root_round_trip(tmp_path):
+    zeros, poles, gain = [0.5 + 0.5j], [0.3], 1.0
+    library = FilterLibrary(str(tmp_path))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # A ComplexWarning means the sections were truncated
+        entry = library.save("x", zeros, poles, gain)
+
+    stored = read_filter_npz(str(tmp_path / entry["file"]))
+    assert np.iscomplexobj(stored["sos"])
+
+    w = np.linspace(0, np.pi, 64)
+    expected = zpk_response(zeros, poles, gain, w)
+    for sos in (stored["sos"], FilterLibrary(str(tmp_path)).design("x", output="sos")):
+        assert np.allclose(sos_response(sos, w), expected)
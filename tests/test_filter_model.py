@@ -0,0 +1,23 @@
+import pytest
+
+from app.model.filter_model import FilterModel
+from app.utils.filter_io import write_filter_npz
+
+
+def test_complex_gain_file_is_rejected(tmp_path):
+    path = str(tmp_path / "complex.npz")
+    write_filter_npz(path, [0.5], [0.3], gain=1 + 1j)
+    model = FilterModel()
+    model.add_root(0.2, "zero")
+    with pytest.raises(ValueError, match="gain must be real"):
+        model.load_file(path)
+    assert model.zeros == [0.2] and model.gain == 1.0
+
+
+def test_combined_roots_cannot_change_the_cache():
+    model = FilterModel()
+    model.add_root(0.5 + 0.5j, "zero", conjugate=True)
+    zeros, poles = model.combined_roots()
+    with pytest.raises(AttributeError):
+        zeros.append(0.9)
+    assert model.combined_roots() == (zeros, poles)